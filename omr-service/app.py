@@ -8,12 +8,15 @@ import uvicorn
 from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-import aiofiles
 import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 import uuid
 from pathlib import Path
 import logging
+import shutil
 from typing import Optional
 
 # Configure logging
@@ -21,7 +24,10 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 from omr.audiveris import AudiverisProcessor
+from omr.cache import MusicXMLCache
 from omr.converter import MusicXMLToClairKeysConverter
+from omr.jobs import create_job_store
+from omr.pages import PDF_MAGIC, check_pdf_page_count, is_pdf_header
 from omr.storage import SupabaseStorage
 
 # Initialize FastAPI app
@@ -42,11 +48,46 @@ app.add_middleware(
 
 # Initialize processors
 audiveris_processor = AudiverisProcessor()
+musicxml_cache = MusicXMLCache()
 converter = MusicXMLToClairKeysConverter()
 storage = SupabaseStorage()
 
-# Processing status storage (in production, use Redis or database)
-processing_jobs = {}
+# Processing status storage, shared across workers when REDIS_URL is set.
+# Audiveris admission stays per process, so run a single worker.
+job_store = create_job_store()
+
+# MusicXML conversion is CPU-bound; run it in worker processes so it neither
+# blocks the event loop nor serializes on the GIL. Workers are spawned, not
+# forked, because forking after to_thread has started threads can deadlock.
+# A spawned worker re-imports the __main__ module, so the server is started
+# with `python3 -m uvicorn app:app` rather than `python3 app.py`.
+def create_converter_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=int(os.getenv("CONVERTER_WORKERS", str(os.cpu_count() or 1))),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+converter_pool = create_converter_pool()
+
+def replace_broken_converter_pool(broken_pool: ProcessPoolExecutor) -> None:
+    """Start a fresh pool after a worker died (e.g. OOM-killed)
+
+    A dead worker breaks the whole pool; without a replacement every later
+    conversion fails until the service restarts. Jobs that shared the broken
+    pool all land here, so only the first replaces it.
+    """
+    global converter_pool
+    if converter_pool is not broken_pool:
+        return
+    logger.warning("Converter worker died; starting a new converter pool")
+    converter_pool = create_converter_pool()
+    broken_pool.shutdown(wait=False, cancel_futures=True)
+
+# Read size when copying an upload to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Larger scores are rejected before Audiveris is started
+MAX_PDF_PAGES = int(os.getenv("OMR_MAX_PAGES", "100"))
 
 class ProcessingStatus:
     PENDING = "pending"
@@ -54,6 +95,13 @@ class ProcessingStatus:
     COMPLETED = "completed"
     FAILED = "failed"
 
+@app.on_event("shutdown")
+async def shutdown():
+    """Release shared clients and worker processes"""
+    await job_store.close()
+    await storage.aclose()
+    converter_pool.shutdown(wait=False, cancel_futures=True)
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint for Fly.io"""
@@ -83,22 +131,41 @@ async def process_pdf(
     if not file.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
     
+    # Reject non-PDF content before it can take a conversion slot
+    header = await file.read(len(PDF_MAGIC))
+    await file.seek(0)
+    if not is_pdf_header(header):
+        raise HTTPException(status_code=400, detail="Uploaded file is not a PDF")
+    
+    # Each admitted job may end up holding a multi-GB Audiveris JVM; refuse new
+    # work once the running and queued conversions are at their limits
+    if not audiveris_processor.admit_conversion():
+        raise HTTPException(
+            status_code=429,
+            detail="OMR queue is full, retry later",
+            headers={"Retry-After": "60"}
+        )
+    
     # Generate unique job ID
     job_id = str(uuid.uuid4())
     
     # Initialize job status
-    processing_jobs[job_id] = {
-        "status": ProcessingStatus.PENDING,
-        "progress": 0,
-        "message": "Job queued for processing",
-        "created_at": datetime.utcnow().isoformat(),
-        "file_info": {
-            "filename": file.filename,
-            "title": title,
-            "composer": composer,
-            "user_id": user_id
-        }
-    }
+    try:
+        await job_store.create(job_id, {
+            "status": ProcessingStatus.PENDING,
+            "progress": 0,
+            "message": "Job queued for processing",
+            "created_at": datetime.utcnow().isoformat(),
+            "file_info": {
+                "filename": file.filename,
+                "title": title,
+                "composer": composer,
+                "user_id": user_id
+            }
+        }, user_id)
+    except Exception:
+        audiveris_processor.release_conversion()
+        raise
     
     # Start background processing
     background_tasks.add_task(process_pdf_background, job_id, file, title, composer, user_id)
@@ -112,10 +179,16 @@ async def process_pdf(
 @app.get("/status/{job_id}")
 async def get_processing_status(job_id: str):
     """Get processing status for a job"""
-    if job_id not in processing_jobs:
+    job = await job_store.get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    return processing_jobs[job_id]
+    return job
+
+def _save_upload_sync(path: Path, upload: UploadFile) -> None:
+    """Copy an upload's spooled file to disk in fixed-size chunks"""
+    with open(path, 'wb') as f:
+        shutil.copyfileobj(upload.file, f, UPLOAD_CHUNK_SIZE)
 
 async def process_pdf_background(
     job_id: str,
@@ -127,78 +200,114 @@ async def process_pdf_background(
     """Background task for processing PDF"""
     try:
         # Update status to processing
-        processing_jobs[job_id]["status"] = ProcessingStatus.PROCESSING
-        processing_jobs[job_id]["progress"] = 10
-        processing_jobs[job_id]["message"] = "Saving uploaded file"
+        await job_store.update(
+            job_id,
+            status=ProcessingStatus.PROCESSING,
+            progress=10,
+            message="Saving uploaded file",
+        )
         
         # Create temporary directories using mounted volume
         temp_dir = Path(f"/data/processing/{job_id}")
         temp_dir.mkdir(parents=True, exist_ok=True)
         
-        # Save uploaded file
+        # Save uploaded file with one executor hop for the whole copy
         pdf_path = temp_dir / f"input.pdf"
-        async with aiofiles.open(pdf_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+        await asyncio.to_thread(_save_upload_sync, pdf_path, file)
         
         logger.info(f"Saved PDF for job {job_id}: {pdf_path}")
         
-        # Step 1: PDF to MusicXML using Audiveris
-        processing_jobs[job_id]["progress"] = 30
-        processing_jobs[job_id]["message"] = "Processing PDF with Audiveris OMR"
-        
-        musicxml_path = await audiveris_processor.process_pdf(pdf_path, temp_dir)
-        logger.info(f"Generated MusicXML for job {job_id}: {musicxml_path}")
+        # Step 1: PDF to MusicXML using Audiveris, unless this exact PDF has
+        # been recognised before
+        pdf_digest = await musicxml_cache.digest(pdf_path)
+        musicxml_path = await musicxml_cache.get(pdf_digest, temp_dir)
+        if musicxml_path is not None:
+            logger.info(f"Reused cached MusicXML for job {job_id}: {pdf_digest}")
+        else:
+            # Fail corrupt, empty or oversized PDFs before starting a JVM
+            await asyncio.to_thread(check_pdf_page_count, pdf_path, MAX_PDF_PAGES)
+            
+            await job_store.update(
+                job_id, progress=30, message="Processing PDF with Audiveris OMR"
+            )
+            
+            musicxml_path = await audiveris_processor.process_pdf(pdf_path, temp_dir)
+            logger.info(f"Generated MusicXML for job {job_id}: {musicxml_path}")
+            await musicxml_cache.put(pdf_digest, musicxml_path)
         
         # Step 2: MusicXML to ClairKeys JSON
-        processing_jobs[job_id]["progress"] = 60
-        processing_jobs[job_id]["message"] = "Converting to ClairKeys format"
+        await job_store.update(
+            job_id, progress=60, message="Converting to ClairKeys format"
+        )
         
-        clairkeys_data = await converter.convert(musicxml_path, title, composer)
+        pool = converter_pool
+        try:
+            json_path = await converter.convert_to_file(
+                musicxml_path,
+                temp_dir / "animation.json",
+                title,
+                composer,
+                executor=pool,
+                float_digits=storage.float_digits,
+            )
+        except BrokenProcessPool:
+            replace_broken_converter_pool(pool)
+            raise
         logger.info(f"Converted to ClairKeys format for job {job_id}")
         
         # Step 3: Upload to Supabase Storage
-        processing_jobs[job_id]["progress"] = 80
-        processing_jobs[job_id]["message"] = "Uploading result to storage"
+        await job_store.update(
+            job_id, progress=80, message="Uploading result to storage"
+        )
         
-        storage_url = await storage.upload_animation_data(
+        storage_url = await storage.upload_animation_data_file(
             job_id, 
-            clairkeys_data, 
+            json_path, 
             title or file.filename,
             user_id
         )
         logger.info(f"Uploaded to storage for job {job_id}: {storage_url}")
         
         # Step 4: Complete
-        processing_jobs[job_id]["status"] = ProcessingStatus.COMPLETED
-        processing_jobs[job_id]["progress"] = 100
-        processing_jobs[job_id]["message"] = "Processing completed successfully"
-        processing_jobs[job_id]["result"] = {
-            "animation_data_url": storage_url,
-            "title": title or file.filename,
-            "composer": composer,
-            "processed_at": datetime.utcnow().isoformat()
-        }
+        await job_store.update(
+            job_id,
+            status=ProcessingStatus.COMPLETED,
+            progress=100,
+            message="Processing completed successfully",
+            result={
+                "animation_data_url": storage_url,
+                "title": title or file.filename,
+                "composer": composer,
+                "processed_at": datetime.utcnow().isoformat()
+            },
+        )
         
-        # Cleanup temporary files
-        import shutil
-        shutil.rmtree(temp_dir, ignore_errors=True)
+        # Cleanup temporary files off the event loop; Audiveris leaves many
+        # intermediate artifacts behind
+        await asyncio.to_thread(shutil.rmtree, temp_dir, ignore_errors=True)
         
         logger.info(f"Successfully completed job {job_id}")
         
     except Exception as e:
         logger.error(f"Error processing job {job_id}: {str(e)}")
-        processing_jobs[job_id]["status"] = ProcessingStatus.FAILED
-        processing_jobs[job_id]["message"] = f"Processing failed: {str(e)}"
-        processing_jobs[job_id]["error"] = str(e)
+        await job_store.update(
+            job_id,
+            status=ProcessingStatus.FAILED,
+            message=f"Processing failed: {str(e)}",
+            error=str(e),
+        )
         
         # Cleanup on error
         temp_dir = Path(f"/data/processing/{job_id}")
         if temp_dir.exists():
-            import shutil
-            shutil.rmtree(temp_dir, ignore_errors=True)
+            await asyncio.to_thread(shutil.rmtree, temp_dir, ignore_errors=True)
+    
+    finally:
+        audiveris_processor.release_conversion()
 
 if __name__ == "__main__":
+    # Development only: converter workers re-import this file as their main
+    # module, so containers run `python3 -m uvicorn app:app` instead
     port = int(os.getenv("PORT", 8000))
     uvicorn.run(
         "app:app",
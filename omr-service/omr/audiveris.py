@@ -8,6 +8,9 @@ import logging
 from pathlib import Path
 from typing import Optional
 import os
+import xml.etree.ElementTree as ET
+
+from omr.pages import load_musicxml_page, merge_musicxml_trees, split_pdf_pages
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +22,8 @@ class AudiverisProcessor:
         audiveris_executable: Optional[Path] = None,
         max_concurrent_conversions: Optional[int] = None,
         process_timeout_seconds: Optional[float] = None,
+        split_pages: Optional[bool] = None,
+        max_queued_conversions: Optional[int] = None,
     ):
         configured_executable = os.getenv(
             "AUDIVERIS_EXECUTABLE", "/opt/audiveris/bin/Audiveris"
@@ -31,7 +36,15 @@ class AudiverisProcessor:
             concurrency = int(os.getenv("AUDIVERIS_MAX_CONCURRENCY", "1"))
         if concurrency < 1:
             raise ValueError("AUDIVERIS_MAX_CONCURRENCY must be at least 1")
+        self.max_concurrent_conversions = concurrency
         self._conversion_slots = asyncio.Semaphore(concurrency)
+        queue_limit = max_queued_conversions
+        if queue_limit is None:
+            queue_limit = int(os.getenv("AUDIVERIS_MAX_QUEUE", "4"))
+        if queue_limit < 0:
+            raise ValueError("AUDIVERIS_MAX_QUEUE must not be negative")
+        self.max_queued_conversions = queue_limit
+        self._admitted_conversions = 0
         timeout_seconds = process_timeout_seconds
         if timeout_seconds is None:
             timeout_seconds = float(
@@ -40,6 +53,30 @@ class AudiverisProcessor:
         if timeout_seconds <= 0:
             raise ValueError("AUDIVERIS_TIMEOUT_SECONDS must be greater than 0")
         self.process_timeout_seconds = timeout_seconds
+        if split_pages is None:
+            split_pages = os.getenv("AUDIVERIS_SPLIT_PAGES", "0") == "1"
+        self.split_pages = split_pages
+
+    def admit_conversion(self) -> bool:
+        """
+        Reserve room for one conversion before it is scheduled
+
+        Admitted conversions are either running (holding a slot) or queued for
+        one. Callers must pair a successful admission with
+        `release_conversion` once the conversion finishes.
+
+        Returns:
+            True if admitted, False if running and queued conversions are full
+        """
+        capacity = self.max_concurrent_conversions + self.max_queued_conversions
+        if self._admitted_conversions >= capacity:
+            return False
+        self._admitted_conversions += 1
+        return True
+
+    def release_conversion(self) -> None:
+        """Give back an admission taken with `admit_conversion`"""
+        self._admitted_conversions = max(0, self._admitted_conversions - 1)
 
     async def _kill_and_wait(
         self,
@@ -81,70 +118,87 @@ class AudiverisProcessor:
         Returns:
             Path to generated MusicXML file
         """
+        if self.split_pages:
+            page_paths = await asyncio.to_thread(
+                split_pdf_pages, pdf_path, output_dir / "pages"
+            )
+            if len(page_paths) > 1:
+                return await self._process_pages(pdf_path, page_paths, output_dir)
+
         async with self._conversion_slots:
             return await self._process_pdf_unlocked(pdf_path, output_dir)
 
+    async def _process_pages(
+        self, pdf_path: Path, page_paths: list[Path], output_dir: Path
+    ) -> Path:
+        """Recognise page PDFs in per-slot Audiveris runs, then merge in order.
+
+        Pages are split into one contiguous batch per conversion slot and each
+        batch is passed to a single Audiveris invocation, so a JVM starts once
+        per slot rather than once per page. At most AUDIVERIS_MAX_CONCURRENCY
+        JVMs are alive at once. Each finished batch is queued and its pages are
+        parsed while later batches are still running, leaving only the
+        concatenation for the end. If any stage fails the remaining runs are
+        cancelled, which kills their processes.
+        """
+        batch_count = min(self.max_concurrent_conversions, len(page_paths))
+        batch_size = -(-len(page_paths) // batch_count)
+        batches = [
+            page_paths[start:start + batch_size]
+            for start in range(0, len(page_paths), batch_size)
+        ]
+        logger.info(
+            f"Processing {len(page_paths)} pages of {pdf_path} "
+            f"in {len(batches)} Audiveris runs"
+        )
+
+        finished_batches: asyncio.Queue = asyncio.Queue(maxsize=len(batches))
+        parsed_batches: dict[int, list[ET.ElementTree]] = {}
+
+        async def run_batch(index: int, batch: list[Path]) -> None:
+            async with self._conversion_slots:
+                musicxml_paths = await self._process_page_batch_unlocked(
+                    batch, output_dir / f"batch-{index}"
+                )
+            await finished_batches.put((index, musicxml_paths))
+
+        async def parse_batches() -> None:
+            for _ in batches:
+                index, musicxml_paths = await finished_batches.get()
+                parsed_batches[index] = await asyncio.to_thread(
+                    lambda: [load_musicxml_page(path) for path in musicxml_paths]
+                )
+
+        tasks = [
+            asyncio.create_task(run_batch(index, batch))
+            for index, batch in enumerate(batches)
+        ]
+        tasks.append(asyncio.create_task(parse_batches()))
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        page_trees = [
+            tree for index in range(len(batches)) for tree in parsed_batches[index]
+        ]
+        return await asyncio.to_thread(
+            merge_musicxml_trees,
+            page_trees,
+            output_dir / f"{pdf_path.stem}.musicxml",
+        )
+
     async def _process_pdf_unlocked(
         self, pdf_path: Path, output_dir: Path
     ) -> Path:
         try:
             logger.info(f"Starting Audiveris processing for {pdf_path}")
-            
-            if not self.audiveris_executable.is_file() or not os.access(
-                self.audiveris_executable, os.X_OK
-            ):
-                raise FileNotFoundError(
-                    f"Audiveris launcher is not executable: {self.audiveris_executable}"
-                )
 
-            output_dir.mkdir(parents=True, exist_ok=True)
-            
-            cmd = [
-                str(self.audiveris_executable),
-                "-batch",
-                "-export",
-                "-output", str(output_dir),
-                "--",
-                str(pdf_path)
-            ]
-            
-            logger.info(f"Running Audiveris command: {' '.join(cmd)}")
-            
-            # Run Audiveris process
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=output_dir
-            )
-            
-            stdout, stderr = await self._communicate_with_timeout(
-                process,
-                self.process_timeout_seconds,
-            )
-            
-            # Check if process completed successfully
-            if process.returncode != 0:
-                error_msg = f"Audiveris failed with return code {process.returncode}"
-                if stderr:
-                    error_msg += f"\nStderr: {stderr.decode()}"
-                if stdout:
-                    error_msg += f"\nStdout: {stdout.decode()}"
-                logger.error(error_msg)
-                raise RuntimeError(error_msg)
-            
-            output_files = sorted(output_dir.glob("*.mxl"))
-            if not output_files:
-                output_files = sorted(output_dir.glob("*.xml"))
-            if not output_files:
-                raise FileNotFoundError("No MusicXML output file generated")
-            if len(output_files) > 1:
-                raise RuntimeError(
-                    "Audiveris generated multiple MusicXML files; "
-                    "multi-output scores are not yet supported"
-                )
-
-            musicxml_path = output_files[0]
+            await self._run_audiveris([pdf_path], output_dir)
+            musicxml_path = self._find_musicxml_output(output_dir, "*")
             
             logger.info(f"Successfully generated MusicXML: {musicxml_path}")
             return musicxml_path
@@ -152,6 +206,88 @@ class AudiverisProcessor:
         except Exception as e:
             logger.error(f"Error in Audiveris processing: {str(e)}")
             raise
+
+    async def _process_page_batch_unlocked(
+        self, page_paths: list[Path], output_dir: Path
+    ) -> list[Path]:
+        try:
+            logger.info(
+                f"Starting Audiveris processing for {len(page_paths)} pages in one run"
+            )
+
+            await self._run_audiveris(page_paths, output_dir)
+            # Audiveris names each book's export after its input file.
+            musicxml_paths = [
+                self._find_musicxml_output(output_dir, f"{page_path.stem}*")
+                for page_path in page_paths
+            ]
+
+            logger.info(f"Successfully generated {len(musicxml_paths)} page MusicXML files")
+            return musicxml_paths
+
+        except Exception as e:
+            logger.error(f"Error in Audiveris processing: {str(e)}")
+            raise
+
+    async def _run_audiveris(self, input_paths: list[Path], output_dir: Path) -> None:
+        """Run one Audiveris batch export over the given inputs."""
+        if not self.audiveris_executable.is_file() or not os.access(
+            self.audiveris_executable, os.X_OK
+        ):
+            raise FileNotFoundError(
+                f"Audiveris launcher is not executable: {self.audiveris_executable}"
+            )
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        cmd = [
+            str(self.audiveris_executable),
+            "-batch",
+            "-export",
+            "-output", str(output_dir),
+            "--",
+            *(str(input_path) for input_path in input_paths)
+        ]
+        
+        logger.info(f"Running Audiveris command: {' '.join(cmd)}")
+        
+        # Run Audiveris process
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=output_dir
+        )
+        
+        stdout, stderr = await self._communicate_with_timeout(
+            process,
+            self.process_timeout_seconds,
+        )
+        
+        # Check if process completed successfully
+        if process.returncode != 0:
+            error_msg = f"Audiveris failed with return code {process.returncode}"
+            if stderr:
+                error_msg += f"\nStderr: {stderr.decode()}"
+            if stdout:
+                error_msg += f"\nStdout: {stdout.decode()}"
+            logger.error(error_msg)
+            raise RuntimeError(error_msg)
+
+    @staticmethod
+    def _find_musicxml_output(output_dir: Path, name_pattern: str) -> Path:
+        """Return the single MusicXML export whose name matches the pattern."""
+        output_files = sorted(output_dir.glob(f"{name_pattern}.mxl"))
+        if not output_files:
+            output_files = sorted(output_dir.glob(f"{name_pattern}.xml"))
+        if not output_files:
+            raise FileNotFoundError("No MusicXML output file generated")
+        if len(output_files) > 1:
+            raise RuntimeError(
+                "Audiveris generated multiple MusicXML files; "
+                "multi-output scores are not yet supported"
+            )
+        return output_files[0]
     
     async def validate_audiveris_installation(self) -> bool:
         """
@@ -12,58 +12,20 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
-class AlternativeOMRProcessor:
-    """Simple OMR processor that generates demo MusicXML for testing"""
-    
-    def __init__(self):
-        self.processing_delay = 5  # Simulate processing time
-        
-    async def process_pdf(self, pdf_path: Path, output_dir: Path) -> Path:
-        """
-        Process PDF file - generates demo MusicXML for testing
-        
-        Args:
-            pdf_path: Path to input PDF file
-            output_dir: Directory for output files
-            
-        Returns:
-            Path to generated MusicXML file
-        """
-        try:
-            logger.info(f"Starting Alternative OMR processing for {pdf_path}")
-            
-            # Simulate processing time
-            await asyncio.sleep(self.processing_delay)
-            
-            # Generate demo MusicXML
-            musicxml_path = output_dir / "output.xml"
-            demo_musicxml = self._generate_demo_musicxml(pdf_path.name)
-            
-            with open(musicxml_path, 'w', encoding='utf-8') as f:
-                f.write(demo_musicxml)
-            
-            logger.info(f"Successfully generated demo MusicXML: {musicxml_path}")
-            return musicxml_path
-            
-        except Exception as e:
-            logger.error(f"Error in Alternative OMR processing: {str(e)}")
-            raise
-    
-    def _generate_demo_musicxml(self, filename: str) -> str:
-        """Generate demo MusicXML content"""
-        # Simple MusicXML for C major scale
-        return f'''<?xml version="1.0" encoding="UTF-8"?>
+# Simple MusicXML for C major scale, encoded once at import; the two %b slots
+# take the source filename and the encoding date
+_DEMO_MUSICXML_TEMPLATE = b'''<?xml version="1.0" encoding="UTF-8"?>
 <!DOCTYPE score-partwise PUBLIC "-//Recordare//DTD MusicXML 3.1 Partwise//EN"
     "http://www.musicxml.org/dtds/partwise.dtd">
 <score-partwise version="3.1">
     <work>
-        <work-title>Demo: {filename}</work-title>
+        <work-title>Demo: %b</work-title>
     </work>
     <identification>
         <creator type="composer">Demo Composer</creator>
         <encoding>
             <software>ClairKeys Alternative OMR</software>
-            <encoding-date>{datetime.now().strftime("%Y-%m-%d")}</encoding-date>
+            <encoding-date>%b</encoding-date>
         </encoding>
     </identification>
     <defaults>
@@ -170,6 +132,49 @@ class AlternativeOMRProcessor:
         </measure>
     </part>
 </score-partwise>'''
+
+class AlternativeOMRProcessor:
+    """Simple OMR processor that generates demo MusicXML for testing"""
+    
+    def __init__(self):
+        self.processing_delay = 5  # Simulate processing time
+        
+    async def process_pdf(self, pdf_path: Path, output_dir: Path) -> Path:
+        """
+        Process PDF file - generates demo MusicXML for testing
+        
+        Args:
+            pdf_path: Path to input PDF file
+            output_dir: Directory for output files
+            
+        Returns:
+            Path to generated MusicXML file
+        """
+        try:
+            logger.info(f"Starting Alternative OMR processing for {pdf_path}")
+            
+            # Simulate processing time
+            await asyncio.sleep(self.processing_delay)
+            
+            # Generate demo MusicXML
+            musicxml_path = output_dir / "output.xml"
+            demo_musicxml = self._generate_demo_musicxml(pdf_path.name)
+            
+            await asyncio.to_thread(musicxml_path.write_bytes, demo_musicxml)
+            
+            logger.info(f"Successfully generated demo MusicXML: {musicxml_path}")
+            return musicxml_path
+            
+        except Exception as e:
+            logger.error(f"Error in Alternative OMR processing: {str(e)}")
+            raise
+    
+    def _generate_demo_musicxml(self, filename: str) -> bytes:
+        """Generate demo MusicXML content"""
+        return _DEMO_MUSICXML_TEMPLATE % (
+            filename.encode('utf-8'),
+            datetime.now().strftime("%Y-%m-%d").encode('ascii'),
+        )
     
     async def validate_installation(self) -> bool:
         """Always returns True for alternative processor"""
@@ -0,0 +1,124 @@
+"""
+MusicXML Result Cache
+Reuses Audiveris output for PDFs that have already been recognised
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+HASH_CHUNK_SIZE = 1024 * 1024
+CACHE_SWEEP_INTERVAL_SECONDS = 60 * 60
+CACHED_SUFFIXES = ('.mxl', '.xml', '.musicxml')
+
+
+class MusicXMLCache:
+    """Caches MusicXML on disk keyed by the SHA-256 of the source PDF"""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        configured_dir = os.getenv("OMR_CACHE_DIR", "/data/omr-cache")
+        if cache_dir is None and configured_dir:
+            cache_dir = Path(configured_dir)
+        # An empty OMR_CACHE_DIR disables the cache
+        self.cache_dir = cache_dir
+        if ttl_seconds is None:
+            ttl_seconds = float(
+                os.getenv("OMR_CACHE_TTL_SECONDS", str(DEFAULT_CACHE_TTL_SECONDS))
+            )
+        if ttl_seconds <= 0:
+            raise ValueError("OMR_CACHE_TTL_SECONDS must be greater than 0")
+        self.ttl_seconds = ttl_seconds
+        self._last_sweep: Optional[float] = None
+
+    @staticmethod
+    def _digest_file(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    async def digest(self, pdf_path: Path) -> str:
+        """Hash a PDF in a worker thread"""
+        return await asyncio.to_thread(self._digest_file, pdf_path)
+
+    async def get(self, digest: str, output_dir: Path) -> Optional[Path]:
+        """
+        Copy a cached MusicXML result into the job directory
+
+        Args:
+            digest: SHA-256 hex digest of the source PDF
+            output_dir: Directory for the copied MusicXML file
+
+        Returns:
+            Path to the copied MusicXML file, or None on a miss
+        """
+        if self.cache_dir is None:
+            return None
+        try:
+            return await asyncio.to_thread(self._get_sync, digest, output_dir)
+        except OSError as e:
+            logger.warning(f"Error reading MusicXML cache: {str(e)}")
+            return None
+
+    def _get_sync(self, digest: str, output_dir: Path) -> Optional[Path]:
+        for cached_path in self.cache_dir.glob(f"{digest}.*"):
+            if cached_path.suffix not in CACHED_SUFFIXES:
+                continue
+            if time.time() - cached_path.stat().st_mtime > self.ttl_seconds:
+                cached_path.unlink(missing_ok=True)
+                continue
+            musicxml_path = output_dir / f"cached{cached_path.suffix}"
+            shutil.copyfile(cached_path, musicxml_path)
+            return musicxml_path
+        return None
+
+    async def put(self, digest: str, musicxml_path: Path) -> None:
+        """Store a MusicXML result; failures are logged, never raised"""
+        if self.cache_dir is None:
+            return
+        try:
+            await asyncio.to_thread(self._put_sync, digest, musicxml_path)
+        except OSError as e:
+            logger.warning(f"Error writing MusicXML cache: {str(e)}")
+
+    def _put_sync(self, digest: str, musicxml_path: Path) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        cached_path = self.cache_dir / f"{digest}{musicxml_path.suffix}"
+        # Copy then rename so a concurrent reader never sees a partial file
+        partial_path = self.cache_dir / f".{digest}.{os.getpid()}.partial"
+        shutil.copyfile(musicxml_path, partial_path)
+        os.replace(partial_path, cached_path)
+        now = time.monotonic()
+        if (
+            self._last_sweep is None
+            or now - self._last_sweep >= CACHE_SWEEP_INTERVAL_SECONDS
+        ):
+            self._last_sweep = now
+            self._sweep_sync()
+
+    def _sweep_sync(self) -> None:
+        """Delete expired entries and leftover partial copies"""
+        cutoff = time.time() - self.ttl_seconds
+        with os.scandir(self.cache_dir) as entries:
+            for entry in entries:
+                suffix = os.path.splitext(entry.name)[1]
+                if suffix not in CACHED_SUFFIXES and suffix != '.partial':
+                    continue
+                try:
+                    if entry.is_file() and entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                except FileNotFoundError:
+                    continue
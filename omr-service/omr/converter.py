@@ -3,33 +3,199 @@ MusicXML to ClairKeys Converter
 Converts MusicXML files to ClairKeys animation data format
 """
 
+import asyncio
 import json
 import logging
+import operator
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path, PurePosixPath
-from typing import Dict, List, Optional, Any
+from typing import IO, Callable, Dict, Iterator, List, NamedTuple, Optional, Any, Tuple
 import xml.etree.ElementTree as ET
 from datetime import datetime
 import zipfile
 
+try:
+    import orjson
+except ImportError:  # the CLI runs under a bare python3
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Score-level elements whose first occurrence feeds metadata/tempo/key/time.
+_HEADER_TAGS = frozenset({'work-title', 'creator', 'per-minute', 'key', 'time'})
+PARSE_CHUNK_SIZE = 64 * 1024
+
+
+_NOTE_NAMES = ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')
+
+# MIDI note number to note name, indexed by MIDI number; None outside the piano
+# range A0 (21) to C8 (108)
+_MIDI_TO_NOTE: Tuple[Optional[str], ...] = tuple(
+    f"{_NOTE_NAMES[(midi_num - 12) % 12]}{(midi_num - 12) // 12}"
+    if 21 <= midi_num <= 108 else None
+    for midi_num in range(128)
+)
+
+# Octave-4 MIDI number of each step letter, indexed by ord(step); 0 marks a
+# character that is not a step
+_BASE_MIDI: Tuple[int, ...] = tuple(
+    {'C': 60, 'D': 62, 'E': 64, 'F': 65, 'G': 67, 'A': 69, 'B': 71}.get(chr(code), 0)
+    for code in range(128)
+)
+
+
+@lru_cache(maxsize=2048)
+def _note_to_midi(step: str, octave: int, alter: int = 0) -> Optional[int]:
+    """Convert note name to MIDI number"""
+    code = ord(step) if len(step) == 1 else 0
+    base = _BASE_MIDI[code] if code < 128 else 0
+    if base == 0:
+        return None
+    
+    # Calculate MIDI number
+    midi_num = base + (octave - 4) * 12 + alter
+    
+    # Ensure within piano range
+    if 21 <= midi_num <= 108:
+        return midi_num
+    
+    return None
+
+
+class _Measure(NamedTuple):
+    """A measure reduced to what note timing needs, so its DOM can be freed."""
+    divisions: Optional[int]
+    tempo: Optional[float]
+    events: List[tuple]
+
+
+class _ScoreTarget:
+    """`XMLParser` target that materializes one measure or header element at a time.
+
+    Events outside a `<measure>` are dropped unless they open a header element
+    still missing from the header. A measure's subtree is built with a
+    `TreeBuilder`, handed to `reduce_measure` when it closes and then released.
+    """
+
+    def __init__(self, reduce_measure: Callable[[ET.Element], _Measure]):
+        self.header: Dict[str, ET.Element] = {}
+        self.part_measures: List[List[_Measure]] = []
+        self._reduce_measure = reduce_measure
+        self._depth = 0
+        self._builder: Optional[ET.TreeBuilder] = None
+        self._builder_depth = 0
+
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        self._depth += 1
+        if self._builder is not None:
+            self._builder.start(tag, attrib)
+        elif tag == 'part' and self._depth == 2:
+            self.part_measures.append([])
+        elif (tag == 'measure' and self._depth == 3 and self.part_measures) or (
+            tag in _HEADER_TAGS and tag not in self.header
+        ):
+            self._builder = ET.TreeBuilder()
+            self._builder_depth = self._depth
+            self._builder.start(tag, attrib)
+
+    def data(self, text: str) -> None:
+        if self._builder is not None:
+            self._builder.data(text)
+
+    def end(self, tag: str) -> None:
+        depth = self._depth
+        self._depth -= 1
+        if self._builder is None:
+            return
+        elem = self._builder.end(tag)
+        if tag in _HEADER_TAGS and tag not in self.header:
+            if tag != 'creator' or elem.get('type') == 'composer':
+                self.header[tag] = elem
+        if depth == self._builder_depth:
+            self._builder = None
+            if tag == 'measure':
+                self.part_measures[-1].append(self._reduce_measure(elem))
+
+    def close(self) -> Tuple[Dict[str, ET.Element], List[List[_Measure]]]:
+        return self.header, self.part_measures
+
+
+class _NoteColumns(NamedTuple):
+    """Extracted notes as parallel columns, one entry per note in extraction order."""
+    midi: List[int]
+    start: List[float]
+    duration: List[float]
+    hand: List[str]
+    finger: List[Optional[int]]
+    voice: List[Optional[int]]
+    staff: List[Optional[int]]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Materialize canonical note dicts ordered by (start, midi)."""
+        midis, starts, durations, hands, fingers, voices, staves = self
+        order = sorted(range(len(midis)), key=lambda i: (starts[i], midis[i]))
+        notes: List[Dict[str, Any]] = []
+        for i in order:
+            note: Dict[str, Any] = {
+                "midi": midis[i],
+                "start": starts[i],
+                "duration": durations[i],
+                "hand": hands[i],
+                "finger": fingers[i],
+            }
+            if voices[i] is not None:
+                note["voice"] = voices[i]
+            if staves[i] is not None:
+                note["staff"] = staves[i]
+            notes.append(note)
+        return notes
+
+
+@contextmanager
+def open_musicxml(musicxml_path: Path) -> Iterator[IO[bytes]]:
+    """Open plain MusicXML or the root document declared by an MXL container."""
+    if not zipfile.is_zipfile(musicxml_path):
+        with open(musicxml_path, 'rb') as musicxml:
+            yield musicxml
+        return
+
+    with zipfile.ZipFile(musicxml_path) as archive:
+        try:
+            container = ET.fromstring(archive.read("META-INF/container.xml"))
+        except KeyError as exc:
+            raise ValueError("MXL archive has no META-INF/container.xml") from exc
+
+        rootfile = container.find(
+            ".//{urn:oasis:names:tc:opendocument:xmlns:container}rootfile"
+        )
+        if rootfile is None:
+            rootfile = container.find(".//rootfile")
+
+        root_path = rootfile.get("full-path") if rootfile is not None else None
+        if not root_path:
+            raise ValueError("MXL container does not declare a root MusicXML file")
+
+        archive_path = PurePosixPath(root_path)
+        if archive_path.is_absolute() or ".." in archive_path.parts:
+            raise ValueError(f"Unsafe MXL root path: {root_path}")
+
+        try:
+            musicxml = archive.open(root_path)
+        except KeyError as exc:
+            raise ValueError(
+                f"MXL root MusicXML file is missing: {root_path}"
+            ) from exc
+        with musicxml:
+            yield musicxml
+
+
 class MusicXMLToClairKeysConverter:
     """Converts MusicXML to ClairKeys animation data format"""
     
     def __init__(self):
-        # MIDI note number to note name mapping
-        self.midi_to_note = {}
-        self._build_midi_mapping()
-        
-    def _build_midi_mapping(self):
-        """Build MIDI note number to note name mapping"""
-        note_names = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-        
-        for midi_num in range(21, 109):  # Piano range A0 (21) to C8 (108)
-            octave = (midi_num - 12) // 12
-            note_index = (midi_num - 12) % 12
-            note_name = f"{note_names[note_index]}{octave}"
-            self.midi_to_note[midi_num] = note_name
+        self.midi_to_note = _MIDI_TO_NOTE
     
     async def convert(self, musicxml_path: Path, title: Optional[str] = None, composer: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -43,21 +209,26 @@ class MusicXMLToClairKeysConverter:
         Returns:
             ClairKeys animation data as dictionary
         """
+        return self._convert_sync(musicxml_path, title, composer)
+
+    def _convert_sync(self, musicxml_path: Path, title: Optional[str] = None, composer: Optional[str] = None) -> Dict[str, Any]:
+        """Synchronous body of `convert`, safe to run in a worker thread or process."""
         try:
             logger.info(f"Converting MusicXML to ClairKeys format: {musicxml_path}")
             
-            # Audiveris exports compressed MusicXML (.mxl). Resolve its declared
+            # Audiveris exports compressed MusicXML (.mxl). Stream its declared
             # root document without extracting the archive; plain MusicXML remains
             # supported for the existing converter corpus.
-            tree = self._parse_musicxml(musicxml_path)
-            root = tree.getroot()
+            header, part_measures = self._read_score(musicxml_path)
             
             # Extract basic metadata
-            metadata = self._extract_metadata(root, title, composer)
+            metadata = self._extract_metadata(header, title, composer)
             logger.info(f"Extracted metadata: {metadata}")
             
             # Extract notes and timing information
-            notes = self._extract_notes(root)
+            tempo = self._extract_tempo(header)
+            columns = self._extract_notes(part_measures, tempo)
+            notes = columns.to_dicts()
             logger.info(f"Extracted {len(notes)} notes")
             
             # Build ClairKeys animation data structure.
@@ -70,10 +241,10 @@ class MusicXMLToClairKeysConverter:
                 "composer": metadata.get("composer", "Unknown"),
                 "metadata": metadata,
                 "notes": notes,
-                "duration": self._calculate_duration(notes),
-                "tempo": self._extract_tempo(root),
-                "keySignature": self._extract_key_signature(root),
-                "timeSignature": self._extract_time_signature(root),
+                "duration": self._calculate_duration(columns),
+                "tempo": tempo,
+                "keySignature": self._extract_key_signature(header),
+                "timeSignature": self._extract_time_signature(header),
                 "generated_at": datetime.utcnow().isoformat()
             }
             
@@ -84,45 +255,120 @@ class MusicXMLToClairKeysConverter:
             logger.error(f"Error converting MusicXML: {str(e)}")
             raise
 
-    def _parse_musicxml(self, musicxml_path: Path) -> ET.ElementTree:
-        """Parse plain MusicXML or the root document declared by an MXL container."""
-        if not zipfile.is_zipfile(musicxml_path):
-            return ET.parse(musicxml_path)
-
-        with zipfile.ZipFile(musicxml_path) as archive:
-            try:
-                container = ET.fromstring(archive.read("META-INF/container.xml"))
-            except KeyError as exc:
-                raise ValueError("MXL archive has no META-INF/container.xml") from exc
+    async def convert_to_file(
+        self,
+        musicxml_path: Path,
+        output_path: Path,
+        title: Optional[str] = None,
+        composer: Optional[str] = None,
+        executor: Optional[Executor] = None,
+        float_digits: Optional[int] = None,
+    ) -> Path:
+        """
+        Convert MusicXML file and write the animation data as a JSON file
 
-            rootfile = container.find(
-                ".//{urn:oasis:names:tc:opendocument:xmlns:container}rootfile"
-            )
-            if rootfile is None:
-                rootfile = container.find(".//rootfile")
+        Parsing, note extraction and encoding are all CPU-bound, so the whole
+        conversion runs in `executor` (the loop's default thread pool if None).
+        With a `ProcessPoolExecutor` the worker writes the file itself and only
+        paths cross the process boundary, never the animation data.
 
-            root_path = rootfile.get("full-path") if rootfile is not None else None
-            if not root_path:
-                raise ValueError("MXL container does not declare a root MusicXML file")
+        Args:
+            musicxml_path: Path to MusicXML file
+            output_path: Path for the animation JSON file
+            title: Optional title for the piece
+            composer: Optional composer name
+            executor: Executor to run the conversion in
+            float_digits: Decimal places to round floats to, or None to keep them
 
-            archive_path = PurePosixPath(root_path)
-            if archive_path.is_absolute() or ".." in archive_path.parts:
-                raise ValueError(f"Unsafe MXL root path: {root_path}")
+        Returns:
+            Path to the written JSON file
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor,
+            convert_musicxml_file,
+            musicxml_path,
+            output_path,
+            title,
+            composer,
+            float_digits,
+        )
 
-            try:
-                with archive.open(root_path) as musicxml:
-                    return ET.parse(musicxml)
-            except KeyError as exc:
-                raise ValueError(
-                    f"MXL root MusicXML file is missing: {root_path}"
-                ) from exc
-    
-    def _extract_metadata(self, root: ET.Element, title: Optional[str], composer: Optional[str]) -> Dict[str, Any]:
+    @staticmethod
+    def _write_json(animation_data: Dict[str, Any], output_path: Path) -> None:
+        # The file is uploaded as-is, so it is compact. orjson encodes straight
+        # to UTF-8 bytes several times faster than json and produces the same
+        # bytes for this data; the stdlib path keeps the CLI dependency-free.
+        if orjson is not None:
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(animation_data))
+            return
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(animation_data, f, ensure_ascii=False, separators=(',', ':'))
+
+    def _read_score(self, musicxml_path: Path) -> Tuple[Dict[str, ET.Element], List[List[_Measure]]]:
+        """Stream the score once into header elements and compact per-part measures.
+
+        The document is fed in chunks to an `XMLParser` driving `_ScoreTarget`,
+        so no tree is built for the score as a whole. The header maps
+        `work-title`, the composer `creator`, `per-minute`, `key` and `time` to
+        the first such element in document order.
+        """
+        target = _ScoreTarget(self._reduce_measure)
+        parser = ET.XMLParser(target=target)
+        with open_musicxml(musicxml_path) as musicxml:
+            for chunk in iter(lambda: musicxml.read(PARSE_CHUNK_SIZE), b''):
+                parser.feed(chunk)
+        return parser.close()
+
+    def _reduce_measure(self, measure: ET.Element) -> _Measure:
+        """Reduce a measure to its divisions, tempo and timing events.
+
+        Events keep document order: `("backup", ticks)`, `("forward", ticks)`
+        or `("note", ticks, is_chord, pitch, tie_start, tie_stop, finger)`, where
+        `pitch` is `_parse_pitch`'s `(midi, voice, staff)` or None for rests and
+        unpitched notes.
+        """
+        divisions = None
+        attributes = measure.find('attributes')
+        if attributes is not None:
+            div_elem = attributes.find('divisions')
+            if div_elem is not None and div_elem.text:
+                try:
+                    divisions = int(div_elem.text)
+                except ValueError:
+                    pass
+
+        events: List[tuple] = []
+        for elem in measure:
+            tag = elem.tag
+            if tag == 'backup' or tag == 'forward':
+                events.append((tag, self._duration_ticks(elem)))
+            elif tag == 'note':
+                pitch = None if elem.find('rest') is not None else self._parse_pitch(elem)
+                if pitch is not None:
+                    tie_start, tie_stop = self._tie_flags(elem)
+                    finger = self._fingering(elem)
+                else:
+                    tie_start = tie_stop = False
+                    finger = None
+                events.append((
+                    'note',
+                    self._duration_ticks(elem),
+                    elem.find('chord') is not None,
+                    pitch,
+                    tie_start,
+                    tie_stop,
+                    finger,
+                ))
+        return _Measure(divisions, self._find_tempo(measure), events)
+
+    def _extract_metadata(self, header: Dict[str, ET.Element], title: Optional[str], composer: Optional[str]) -> Dict[str, Any]:
         """Extract metadata from MusicXML"""
         metadata = {}
         
         # Try to get title from XML or use provided title
-        work_title = root.find('.//work-title')
+        work_title = header.get('work-title')
         if work_title is not None and work_title.text:
             metadata['title'] = work_title.text.strip()
         elif title:
@@ -131,7 +377,7 @@ class MusicXMLToClairKeysConverter:
             metadata['title'] = "Untitled"
         
         # Try to get composer from XML or use provided composer
-        creator = root.find('.//creator[@type="composer"]')
+        creator = header.get('creator')
         if creator is not None and creator.text:
             metadata['composer'] = creator.text.strip()
         elif composer:
@@ -141,104 +387,97 @@ class MusicXMLToClairKeysConverter:
         
         return metadata
     
-    def _extract_notes(self, root: ET.Element) -> List[Dict[str, Any]]:
+    def _extract_notes(self, part_measures: List[List[_Measure]], default_tempo: float) -> _NoteColumns:
         """Extract notes from MusicXML into canonical timed notes.
 
-        Timing is accumulated in *seconds*, not divisions, because tempo can
-        change between measures and each change re-scales tick->second. Within a
-        measure a cursor tracks the seconds offset so `<backup>`/`<forward>` and
-        `<chord>` place notes at the right onset; `<tie>` merges durations instead
+        Measure starts are accumulated in *seconds*, not divisions, because tempo
+        can change between measures and each change re-scales tick->second. Within
+        a measure an integer tick cursor tracks the offset so `<backup>`/`<forward>`
+        and `<chord>` place notes at the right onset; `<tie>` merges durations instead
         of emitting a second note. Hand comes from `<staff>` (1->R, 2->L), falling
         back to the part index only when no staff is given.
+
+        Notes are appended as columns of primitives; tie merging updates the
+        duration column through the index of the note that opened the tie.
         """
-        notes: List[Dict[str, Any]] = []
-        parts = root.findall('.//part')
+        columns = _NoteColumns([], [], [], [], [], [], [])
+        midis, starts, durations, hands, fingers, voices, staves = columns
         # Tempo is a score-wide property in MusicXML: a <sound tempo> / <per-minute>
         # in one part (conventionally the first) governs playback for every part at
         # that measure position. Build one measure-indexed timeline from all parts so
         # a tempo change declared in one part re-scales the others' timing too.
-        tempo_timeline = self._build_tempo_timeline(parts, self._extract_tempo(root))
+        tempo_timeline = self._build_tempo_timeline(part_measures, default_tempo)
 
-        for part_idx, part in enumerate(parts):
+        for part_idx, measures in enumerate(part_measures):
             divisions = 1
             measure_start_sec = 0.0
             # Tie state must persist across measure boundaries — a note tied into the
             # next measure has to merge with the note that opened the tie — so
             # open_ties lives at part scope, not per measure.
-            open_ties: Dict[Any, Dict[str, Any]] = {}  # (midi, voice) -> tie-open note
-
-            for measure_idx, measure in enumerate(part.findall('measure')):
-                attributes = measure.find('attributes')
-                if attributes is not None:
-                    div_elem = attributes.find('divisions')
-                    if div_elem is not None and div_elem.text:
-                        try:
-                            divisions = int(div_elem.text)
-                        except ValueError:
-                            pass
+            open_ties: Dict[Any, int] = {}  # (midi, voice) -> index of tie-open note
+
+            for measure_idx, measure in enumerate(measures):
+                if measure.divisions is not None:
+                    divisions = measure.divisions
                 if divisions <= 0:
                     divisions = 1
 
-                tempo = tempo_timeline[measure_idx] if measure_idx < len(tempo_timeline) else self._extract_tempo(root)
+                tempo = tempo_timeline[measure_idx] if measure_idx < len(tempo_timeline) else default_tempo
                 sec_per_tick = (60.0 / tempo) / divisions if tempo > 0 else 0.0
 
-                cursor_sec = 0.0        # seconds offset from measure_start_sec
-                measure_max_sec = 0.0   # furthest point reached (measure length)
-                last_onset_sec = 0.0    # onset of the last non-chord note (chords share it)
-
-                for elem in list(measure):
-                    tag = elem.tag
-                    if tag == 'backup':
-                        cursor_sec = max(0.0, cursor_sec - self._duration_ticks(elem) * sec_per_tick)
-                        continue
-                    if tag == 'forward':
-                        cursor_sec += self._duration_ticks(elem) * sec_per_tick
-                        measure_max_sec = max(measure_max_sec, cursor_sec)
+                # Positions inside a measure are exact integer ticks; they become
+                # seconds only where a note is emitted and once at the barline, so
+                # backup/forward/chord bookkeeping is plain int arithmetic with no
+                # float drift.
+                cursor = 0        # tick offset from measure_start_sec
+                measure_max = 0   # furthest tick reached (measure length)
+                last_onset = 0    # onset of the last non-chord note (chords share it)
+
+                for event in measure.events:
+                    kind = event[0]
+                    if kind == 'backup':
+                        cursor = max(0, cursor - event[1])
                         continue
-                    if tag != 'note':
+                    if kind == 'forward':
+                        cursor += event[1]
+                        if cursor > measure_max:
+                            measure_max = cursor
                         continue
 
-                    dur_sec = self._duration_ticks(elem) * sec_per_tick
-                    is_chord = elem.find('chord') is not None
-                    onset_sec = last_onset_sec if is_chord else cursor_sec
-                    end_sec = onset_sec + dur_sec
+                    _, ticks, is_chord, parsed, tie_start, tie_stop, finger = event
+                    onset = last_onset if is_chord else cursor
+                    end = onset + ticks
 
                     # Rests and unpitched/unparseable notes advance time but emit nothing.
-                    parsed = None if elem.find('rest') is not None else self._parse_pitch(elem)
                     if parsed is not None:
+                        dur_sec = ticks * sec_per_tick
                         midi_num, voice, staff = parsed
-                        tie_start, tie_stop = self._tie_flags(elem)
                         key = (midi_num, voice)
                         if tie_stop and key in open_ties:
                             started = open_ties[key]
-                            started['duration'] = round(started['duration'] + dur_sec, 6)
+                            durations[started] = round(durations[started] + dur_sec, 6)
                             if not tie_start:
                                 del open_ties[key]
                         else:
-                            note: Dict[str, Any] = {
-                                "midi": midi_num,
-                                "start": round(measure_start_sec + onset_sec, 6),
-                                "duration": round(dur_sec, 6),
-                                "hand": self._hand_for(staff, part_idx),
-                                "finger": self._fingering(elem),
-                            }
-                            if voice is not None:
-                                note["voice"] = voice
-                            if staff is not None:
-                                note["staff"] = staff
-                            notes.append(note)
                             if tie_start:
-                                open_ties[key] = note
+                                open_ties[key] = len(midis)
+                            midis.append(midi_num)
+                            starts.append(round(measure_start_sec + onset * sec_per_tick, 6))
+                            durations.append(round(dur_sec, 6))
+                            hands.append(self._hand_for(staff, part_idx))
+                            fingers.append(finger)
+                            voices.append(voice)
+                            staves.append(staff)
 
                     if not is_chord:
-                        cursor_sec = end_sec
-                        last_onset_sec = onset_sec
-                    measure_max_sec = max(measure_max_sec, end_sec)
+                        cursor = end
+                        last_onset = onset
+                    if end > measure_max:
+                        measure_max = end
 
-                measure_start_sec += measure_max_sec
+                measure_start_sec += measure_max * sec_per_tick
 
-        notes.sort(key=lambda n: (n['start'], n['midi']))
-        return notes
+        return columns
 
     def _duration_ticks(self, elem: ET.Element) -> int:
         """Read a `<duration>` child as an integer tick count (0 if absent)."""
@@ -274,7 +513,7 @@ class MusicXMLToClairKeysConverter:
             except ValueError:
                 alter_value = 0
 
-        midi_num = self._note_to_midi(step_elem.text, octave, alter_value)
+        midi_num = _note_to_midi(step_elem.text, octave, alter_value)
         if midi_num is None:
             return None
 
@@ -311,8 +550,14 @@ class MusicXMLToClairKeysConverter:
 
     @staticmethod
     def _fingering(note_elem: ET.Element) -> Optional[int]:
-        """Read a fingering 1-5, or None."""
-        fingering_elem = note_elem.find('.//fingering')
+        """Read a fingering 1-5, or None.
+
+        The standard location is `notations/technical/fingering`; a bare
+        `<fingering>` child is also accepted for the demo OMR output.
+        """
+        fingering_elem = note_elem.find('notations/technical/fingering')
+        if fingering_elem is None:
+            fingering_elem = note_elem.find('fingering')
         if fingering_elem is not None and fingering_elem.text and fingering_elem.text.strip().isdigit():
             finger = int(fingering_elem.text.strip())
             if 1 <= finger <= 5:
@@ -320,14 +565,28 @@ class MusicXMLToClairKeysConverter:
         return None
 
     def _find_tempo(self, measure: ET.Element) -> Optional[float]:
-        """Find a tempo (BPM) declared in this measure, or None."""
-        sound = measure.find('.//sound[@tempo]')
+        """Find a tempo (BPM) declared in this measure, or None.
+
+        A `<sound tempo>` (directly in the measure or inside a `<direction>`)
+        wins over a metronome `<per-minute>`. Only those exact MusicXML
+        locations are checked, rather than searching every descendant.
+        """
+        sound = per_minute = None
+        for child in measure:
+            tag = child.tag
+            if tag == 'sound':
+                if sound is None and child.get('tempo') is not None:
+                    sound = child
+            elif tag == 'direction':
+                if sound is None:
+                    sound = child.find('sound[@tempo]')
+                if per_minute is None:
+                    per_minute = child.find('direction-type/metronome/per-minute')
         if sound is not None:
             try:
                 return float(sound.get('tempo'))
             except (TypeError, ValueError):
                 pass
-        per_minute = measure.find('.//per-minute')
         if per_minute is not None and per_minute.text:
             try:
                 return float(per_minute.text)
@@ -335,7 +594,7 @@ class MusicXMLToClairKeysConverter:
                 pass
         return None
 
-    def _build_tempo_timeline(self, parts: List[ET.Element], initial_tempo: float) -> List[float]:
+    def _build_tempo_timeline(self, part_measures: List[List[_Measure]], initial_tempo: float) -> List[float]:
         """Build a measure-indexed tempo (BPM) timeline shared across all parts.
 
         For each measure position, the first tempo declared by any part (scanning
@@ -344,54 +603,32 @@ class MusicXMLToClairKeysConverter:
         global playback change, so parts that carry no tempo of their own still get
         re-scaled at a measure where another part changed tempo.
         """
-        max_measures = max((len(part.findall('measure')) for part in parts), default=0)
+        max_measures = max((len(measures) for measures in part_measures), default=0)
         timeline: List[float] = []
         current = initial_tempo
         for i in range(max_measures):
-            for part in parts:
-                measures = part.findall('measure')
+            for measures in part_measures:
                 if i < len(measures):
-                    measure_tempo = self._find_tempo(measures[i])
+                    measure_tempo = measures[i].tempo
                     if measure_tempo is not None and measure_tempo > 0:
                         current = measure_tempo
                         break
             timeline.append(current)
         return timeline
 
-    def _note_to_midi(self, step: str, octave: int, alter: int = 0) -> Optional[int]:
-        """Convert note name to MIDI number"""
-        try:
-            # Base MIDI numbers for each note in octave 4
-            base_notes = {'C': 60, 'D': 62, 'E': 64, 'F': 65, 'G': 67, 'A': 69, 'B': 71}
-            
-            if step not in base_notes:
-                return None
-            
-            # Calculate MIDI number
-            midi_num = base_notes[step] + (octave - 4) * 12 + alter
-            
-            # Ensure within piano range
-            if 21 <= midi_num <= 108:
-                return midi_num
-            
-            return None
-            
-        except Exception:
-            return None
-    
-    def _calculate_duration(self, notes: List[Dict[str, Any]]) -> float:
+    def _calculate_duration(self, columns: _NoteColumns) -> float:
         """Calculate total duration of the piece"""
-        if not notes:
+        if not columns.midi:
             return 0.0
         
         # Find the latest note end time
-        max_end_time = max(note['start'] + note['duration'] for note in notes)
+        max_end_time = max(map(operator.add, columns.start, columns.duration))
         return max_end_time
     
-    def _extract_tempo(self, root: ET.Element) -> int:
+    def _extract_tempo(self, header: Dict[str, ET.Element]) -> int:
         """Extract tempo from MusicXML (BPM)"""
         # Look for tempo marking
-        tempo_elem = root.find('.//per-minute')
+        tempo_elem = header.get('per-minute')
         if tempo_elem is not None and tempo_elem.text:
             try:
                 return int(float(tempo_elem.text))
@@ -401,9 +638,9 @@ class MusicXMLToClairKeysConverter:
         # Default tempo
         return 120
     
-    def _extract_key_signature(self, root: ET.Element) -> str:
+    def _extract_key_signature(self, header: Dict[str, ET.Element]) -> str:
         """Extract key signature from MusicXML"""
-        key_elem = root.find('.//key')
+        key_elem = header.get('key')
         if key_elem is not None:
             fifths_elem = key_elem.find('fifths')
             if fifths_elem is not None:
@@ -415,9 +652,9 @@ class MusicXMLToClairKeysConverter:
         
         return "C"  # Default to C major
     
-    def _extract_time_signature(self, root: ET.Element) -> str:
+    def _extract_time_signature(self, header: Dict[str, ET.Element]) -> str:
         """Extract time signature from MusicXML"""
-        time_elem = root.find('.//time')
+        time_elem = header.get('time')
         if time_elem is not None:
             beats = time_elem.find('beats')
             beat_type = time_elem.find('beat-type')
@@ -425,3 +662,56 @@ class MusicXMLToClairKeysConverter:
                 return f"{beats.text}/{beat_type.text}"
         
         return "4/4"  # Default time signature
+
+
+def convert_musicxml_file(
+    musicxml_path: Path,
+    output_path: Path,
+    title: Optional[str] = None,
+    composer: Optional[str] = None,
+    float_digits: Optional[int] = None,
+) -> Path:
+    """
+    Convert a MusicXML file to an animation JSON file synchronously
+
+    A module-level function so it can be pickled into a process pool.
+
+    Args:
+        musicxml_path: Path to MusicXML file
+        output_path: Path for the animation JSON file
+        title: Optional title for the piece
+        composer: Optional composer name
+        float_digits: Decimal places to round floats to, or None to keep them
+
+    Returns:
+        Path to the written JSON file
+    """
+    converter = MusicXMLToClairKeysConverter()
+    animation_data = converter._convert_sync(musicxml_path, title, composer)
+    if float_digits is not None:
+        animation_data = quantize_floats(animation_data, float_digits)
+    converter._write_json(animation_data, output_path)
+    return output_path
+
+
+def quantize_floats(value: Any, digits: int) -> Any:
+    """
+    Round every float in nested dicts and lists to `digits` decimal places
+
+    Playback only needs millisecond timing, and shorter numbers make the
+    uploaded animation data smaller, before and after compression.
+
+    Args:
+        value: Animation data or any part of it
+        digits: Decimal places to keep
+
+    Returns:
+        A copy of the value with rounded floats
+    """
+    if isinstance(value, float):
+        return round(value, digits)
+    if isinstance(value, dict):
+        return {key: quantize_floats(item, digits) for key, item in value.items()}
+    if isinstance(value, list):
+        return [quantize_floats(item, digits) for item in value]
+    return value
@@ -0,0 +1,104 @@
+"""
+Processing Job Store
+Tracks /process job status so any worker can answer /status
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_TTL_SECONDS = 24 * 60 * 60
+
+
+class InMemoryJobStore:
+    """Process-local job store, only correct with a single uvicorn worker"""
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+
+    async def create(
+        self, job_id: str, job: Dict[str, Any], user_id: Optional[str] = None
+    ) -> None:
+        self._jobs[job_id] = dict(job)
+
+    async def update(self, job_id: str, **fields: Any) -> None:
+        self._jobs.setdefault(job_id, {}).update(fields)
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(job_id)
+        return dict(job) if job is not None else None
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisJobStore:
+    """Job store shared by every worker through Redis hashes
+
+    Each job lives in the hash `job:{job_id}`, one field per status key with
+    JSON-encoded values so nested fields such as `result` round-trip. Job IDs
+    are also added to `user:{user_id}:jobs` for per-user listings. Every write
+    refreshes the TTL so finished jobs expire on their own.
+    """
+
+    def __init__(self, redis_url: str, ttl_seconds: int = DEFAULT_JOB_TTL_SECONDS):
+        import redis.asyncio as aioredis
+
+        self._redis = aioredis.from_url(redis_url, decode_responses=True)
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"job:{job_id}"
+
+    @staticmethod
+    def _user_key(user_id: str) -> str:
+        return f"user:{user_id}:jobs"
+
+    async def create(
+        self, job_id: str, job: Dict[str, Any], user_id: Optional[str] = None
+    ) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hset(self._job_key(job_id), mapping=self._encode(job))
+            pipe.expire(self._job_key(job_id), self.ttl_seconds)
+            if user_id:
+                pipe.sadd(self._user_key(user_id), job_id)
+                pipe.expire(self._user_key(user_id), self.ttl_seconds)
+            await pipe.execute()
+
+    async def update(self, job_id: str, **fields: Any) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.hset(self._job_key(job_id), mapping=self._encode(fields))
+            pipe.expire(self._job_key(job_id), self.ttl_seconds)
+            await pipe.execute()
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self._redis.hgetall(self._job_key(job_id))
+        if not raw:
+            return None
+        return {field: json.loads(value) for field, value in raw.items()}
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+    @staticmethod
+    def _encode(fields: Dict[str, Any]) -> Dict[str, str]:
+        return {field: json.dumps(value) for field, value in fields.items()}
+
+
+def create_job_store():
+    """Use Redis when REDIS_URL is set, otherwise fall back to process memory"""
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url:
+        logger.warning(
+            "REDIS_URL not configured; job status is local to this worker"
+        )
+        return InMemoryJobStore()
+
+    ttl_seconds = int(os.getenv("JOB_TTL_SECONDS", str(DEFAULT_JOB_TTL_SECONDS)))
+    if ttl_seconds < 1:
+        raise ValueError("JOB_TTL_SECONDS must be at least 1")
+    return RedisJobStore(redis_url, ttl_seconds)
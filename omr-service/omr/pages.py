@@ -0,0 +1,160 @@
+"""
+PDF Page Splitting and MusicXML Page Merging
+Lets Audiveris recognise a multi-page score one page at a time
+"""
+
+import logging
+from pathlib import Path
+from typing import List, Sequence
+import xml.etree.ElementTree as ET
+
+from omr.converter import open_musicxml
+
+logger = logging.getLogger(__name__)
+
+# Every PDF starts with this signature
+PDF_MAGIC = b"%PDF-"
+
+
+def is_pdf_header(header: bytes) -> bool:
+    """Whether the first bytes of an upload are the PDF signature"""
+    return header.startswith(PDF_MAGIC)
+
+
+def count_pdf_pages(pdf_path: Path) -> int:
+    """
+    Count the pages of a PDF without rendering them
+
+    Args:
+        pdf_path: Path to input PDF file
+
+    Returns:
+        Number of pages
+    """
+    from pypdf import PdfReader
+
+    return len(PdfReader(str(pdf_path), strict=False).pages)
+
+
+def check_pdf_page_count(pdf_path: Path, max_pages: int) -> int:
+    """
+    Count the pages of a PDF, rejecting ones Audiveris should never see
+
+    Args:
+        pdf_path: Path to input PDF file
+        max_pages: Largest accepted page count
+
+    Returns:
+        Number of pages
+
+    Raises:
+        ValueError: If the PDF is unreadable (corrupt or encrypted), has no
+            pages or has more than `max_pages`
+    """
+    from pypdf.errors import PdfReadError
+
+    try:
+        page_count = count_pdf_pages(pdf_path)
+    except PdfReadError as e:
+        raise ValueError(f"PDF could not be read: {str(e)}") from e
+    if page_count == 0:
+        raise ValueError("PDF has no pages")
+    if page_count > max_pages:
+        raise ValueError(
+            f"PDF has {page_count} pages; at most {max_pages} are supported"
+        )
+    return page_count
+
+
+def split_pdf_pages(pdf_path: Path, output_dir: Path) -> List[Path]:
+    """
+    Write each page of a PDF to its own single-page PDF
+
+    Args:
+        pdf_path: Path to input PDF file
+        output_dir: Directory for the page PDFs
+
+    Returns:
+        Page PDF paths in page order
+    """
+    from pypdf import PdfReader, PdfWriter
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    reader = PdfReader(str(pdf_path))
+    page_paths = []
+    for index, page in enumerate(reader.pages, start=1):
+        writer = PdfWriter()
+        writer.add_page(page)
+        page_path = output_dir / f"page-{index:04d}.pdf"
+        with open(page_path, "wb") as f:
+            writer.write(f)
+        page_paths.append(page_path)
+    return page_paths
+
+
+def load_musicxml_page(page_path: Path) -> ET.ElementTree:
+    """Parse one page's MusicXML or MXL export"""
+    with open_musicxml(page_path) as musicxml:
+        return ET.parse(musicxml)
+
+
+def merge_musicxml_pages(page_paths: Sequence[Path], output_path: Path) -> Path:
+    """
+    Concatenate per-page partwise MusicXML into one score
+
+    Args:
+        page_paths: MusicXML or MXL files in page order
+        output_path: Path for the merged MusicXML file
+
+    Returns:
+        Path to the merged MusicXML file
+    """
+    return merge_musicxml_trees(
+        [load_musicxml_page(page_path) for page_path in page_paths], output_path
+    )
+
+
+def merge_musicxml_trees(
+    page_trees: Sequence[ET.ElementTree], output_path: Path
+) -> Path:
+    """
+    Concatenate parsed per-page partwise MusicXML into one score
+
+    The first page supplies the header and part list. Every later page must
+    declare the same part IDs in the same order; its measures are appended to
+    the matching part and all measures are renumbered from 1 so the result
+    reads as one continuous score.
+
+    Args:
+        page_trees: Parsed pages in page order; the first tree is modified
+        output_path: Path for the merged MusicXML file
+
+    Returns:
+        Path to the merged MusicXML file
+    """
+    if not page_trees:
+        raise ValueError("No MusicXML pages to merge")
+
+    tree = page_trees[0]
+    score = tree.getroot()
+    parts = score.findall("part")
+    part_ids = [part.get("id") for part in parts]
+
+    for page_number, page_tree in enumerate(page_trees[1:], start=2):
+        page_parts = page_tree.getroot().findall("part")
+        page_part_ids = [part.get("id") for part in page_parts]
+        if page_part_ids != part_ids:
+            raise ValueError(
+                f"Page {page_number} parts {page_part_ids} do not match "
+                f"page 1 parts {part_ids}"
+            )
+        for part, page_part in zip(parts, page_parts):
+            part.extend(page_part.findall("measure"))
+
+    for part in parts:
+        for number, measure in enumerate(part.findall("measure"), start=1):
+            measure.set("number", str(number))
+
+    tree.write(output_path, encoding="UTF-8", xml_declaration=True)
+    logger.info(f"Merged {len(page_trees)} MusicXML pages into {output_path}")
+    return output_path
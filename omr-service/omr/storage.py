@@ -3,26 +3,169 @@ Supabase Storage Integration
 Handles uploading animation data to Supabase Storage
 """
 
-import json
+import asyncio
+import base64
+import gzip
 import logging
 import os
-from typing import Dict, Any, Optional
+import shutil
+import time
+import zlib
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, Any, Iterator, List, Optional, Set, Tuple
 import httpx
-from datetime import datetime
-import uuid
+import orjson
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception_type,
+    retry_if_result,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
+
+from omr.converter import quantize_floats
 
 logger = logging.getLogger(__name__)
 
+# Read size when streaming a file body to Supabase
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Animation JSON is repetitive; level 6 gets most of the ratio for little CPU
+GZIP_COMPRESS_LEVEL = 6
+
+# zlib window bits that select the gzip container
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+# List items (notes) encoded per chunk when streaming JSON
+JSON_STREAM_BATCH_SIZE = 1000
+
+# Decimal places kept for floats (timings in seconds) in uploaded data
+DEFAULT_FLOAT_DIGITS = 3
+
+# Supabase recommends resumable uploads above 6 MB and requires 6 MiB chunks
+RESUMABLE_UPLOAD_THRESHOLD = 6 * 1000 * 1000
+RESUMABLE_CHUNK_SIZE = 6 * 1024 * 1024
+
+# Transport failures tolerated per resumable upload before giving up
+RESUMABLE_CHUNK_ATTEMPTS = 3
+
+# Attempts per upload request before giving up; transient failures are
+# retried with jittered exponential backoff capped at RETRY_MAX_WAIT_SECONDS
+UPLOAD_ATTEMPTS = 4
+RETRY_MAX_WAIT_SECONDS = 5.0
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# How long test_connection trusts its last result; failures expire sooner
+# so a recovered backend is noticed quickly
+CONNECTION_OK_TTL_SECONDS = 30.0
+CONNECTION_FAILED_TTL_SECONDS = 5.0
+
+# Where animation data is saved when Supabase is unavailable
+LOCAL_STORAGE_DIR = "/tmp/results"
+
+# Content type of each supported animation data format
+CONTENT_TYPES = {
+    "json": "application/json",
+    "msgpack": "application/msgpack",
+}
+
+def _is_retryable_response(response: httpx.Response) -> bool:
+    return response.status_code in RETRYABLE_STATUS_CODES
+
+
+def _is_duplicate_response(response: httpx.Response) -> bool:
+    """Supabase rejects an existing object with 409, or 400 and a Duplicate body"""
+    if response.status_code == 409:
+        return True
+    return response.status_code == 400 and "Duplicate" in response.text
+
+
+_backoff_wait = wait_exponential_jitter(initial=0.2, max=RETRY_MAX_WAIT_SECONDS)
+
+
+def _retry_wait(retry_state: RetryCallState) -> float:
+    """Honor a numeric Retry-After, otherwise back off exponentially"""
+    outcome = retry_state.outcome
+    if outcome is not None and not outcome.failed:
+        retry_after = outcome.result().headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), RETRY_MAX_WAIT_SECONDS)
+    return _backoff_wait(retry_state)
+
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    outcome = retry_state.outcome
+    reason = (
+        str(outcome.exception()) if outcome.failed
+        else f"status {outcome.result().status_code}"
+    )
+    logger.warning(
+        f"Supabase request failed ({reason}); retrying in "
+        f"{retry_state.next_action.sleep:.1f}s"
+    )
+
+
 class SupabaseStorage:
     """Handles uploading animation data to Supabase Storage"""
     
-    def __init__(self):
+    # Directories already created by this process
+    _created_dirs: Set[str] = set()
+    
+    def __init__(
+        self,
+        pool_size: int = 20,
+        gzip_uploads: Optional[bool] = None,
+        data_format: Optional[str] = None
+    ):
         self.supabase_url = os.getenv("SUPABASE_URL")
         self.supabase_key = os.getenv("SUPABASE_ANON_KEY")
         self.bucket_name = "animation-data"
+        if gzip_uploads is None:
+            gzip_uploads = os.getenv("ANIMATION_DATA_GZIP", "0") == "1"
+        self.gzip_uploads = gzip_uploads
+        if data_format is None:
+            data_format = os.getenv("ANIMATION_DATA_FORMAT", "json")
+        if data_format not in CONTENT_TYPES:
+            raise ValueError("ANIMATION_DATA_FORMAT must be 'json' or 'msgpack'")
+        self.data_format = data_format
+        # ANIMATION_FLOAT_DIGITS= (empty) uploads floats at full precision
+        float_digits = os.getenv("ANIMATION_FLOAT_DIGITS", str(DEFAULT_FLOAT_DIGITS))
+        self.float_digits = int(float_digits) if float_digits else None
         
-        if not self.supabase_url or not self.supabase_key:
+        self._configured = bool(self.supabase_url and self.supabase_key)
+        if not self._configured:
             logger.warning("Supabase credentials not configured")
+        self._upload_url_prefix = f"{self.supabase_url}/storage/v1/object/{self.bucket_name}/"
+        self._public_url_prefix = f"{self.supabase_url}/storage/v1/object/public/{self.bucket_name}/"
+        self._resumable_upload_url = f"{self.supabase_url}/storage/v1/upload/resumable"
+        self._connection_ok = False
+        self._connection_checked_until = 0.0
+        
+        # One long-lived client so uploads reuse keep-alive connections
+        # instead of paying a TCP and TLS handshake per request. HTTP/2 (when
+        # the server negotiates it) multiplexes concurrent uploads as streams
+        # over a single connection. The auth headers never change, so they are
+        # client defaults rather than rebuilt per request.
+        auth_headers = {}
+        if self._configured:
+            auth_headers = {
+                "Authorization": f"Bearer {self.supabase_key}",
+                "apikey": self.supabase_key
+            }
+        self._client = httpx.AsyncClient(
+            headers=auth_headers,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size
+            ),
+            timeout=30.0
+        )
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP connections"""
+        await self._client.aclose()
     
     async def upload_animation_data(
         self, 
@@ -43,76 +186,451 @@ class SupabaseStorage:
         Returns:
             Public URL of uploaded file
         """
-        try:
-            if not self.supabase_url or not self.supabase_key:
-                # Fallback: save to local file for testing
-                return await self._save_local_fallback(job_id, animation_data, title)
+        filename = self._filename(job_id)
+        
+        async def send() -> httpx.Response:
+            if self.data_format == "msgpack":
+                packed = await asyncio.to_thread(self._encode_bytes, animation_data)
+                return await self._post_object(filename, lambda: packed)
+            # The JSON is encoded, rounded and sent piecewise with chunked
+            # transfer encoding, never as one serialized or rounded copy next
+            # to the dict
+            return await self._post_object(
+                filename,
+                lambda: self._iter_json(
+                    animation_data, self.gzip_uploads, self.float_digits
+                )
+            )
+        
+        # JSON saved locally is indented for reading while debugging
+        return await self._upload(
+            filename,
+            send,
+            lambda: self._save_local_fallback(
+                job_id, lambda path: self._write_encoded(animation_data, path)
+            )
+        )
+    
+    async def upload_many(
+        self,
+        jobs: List[Tuple[str, Dict[str, Any], str]],
+        concurrency: int = 16
+    ) -> List[str]:
+        """
+        Upload animation data for several jobs concurrently
+        
+        Uploads share the pooled client; the semaphore bounds how many are in
+        flight at once.
+        
+        Args:
+            jobs: (job_id, animation_data, title) for each upload
+            concurrency: Maximum simultaneous uploads
             
-            # Generate unique filename
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            filename = f"{timestamp}_{job_id}.json"
+        Returns:
+            URLs of the uploaded files, in the order of `jobs`
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def upload_one(job_id: str, animation_data: Dict[str, Any], title: str) -> str:
+            async with semaphore:
+                return await self.upload_animation_data(job_id, animation_data, title)
+        
+        return await asyncio.gather(*(upload_one(*job) for job in jobs))
+    
+    async def upload_animation_data_file(
+        self,
+        job_id: str,
+        json_path: Path,
+        title: str,
+        user_id: Optional[str] = None
+    ) -> str:
+        """
+        Upload an animation JSON file to Supabase Storage
+        
+        The file is streamed in fixed-size chunks, so the upload never holds
+        the serialized document in memory.
+        
+        Args:
+            job_id: Unique job identifier
+            json_path: Path to the animation JSON file
+            title: Title of the piece
+            user_id: Optional user ID for access control
             
-            # Convert animation data to JSON
-            json_content = json.dumps(animation_data, indent=2)
+        Returns:
+            Public URL of uploaded file
+        """
+        filename = self._filename(job_id)
+        
+        async def send() -> httpx.Response:
+            # Re-encode or compress to a sibling file first so the body
+            # length is known
+            body_path = json_path
+            if self.data_format != "json" or self.gzip_uploads:
+                body_path = json_path.with_name(filename)
+                await asyncio.to_thread(self._encode_file, json_path, body_path)
             
-            # Upload to Supabase Storage
-            headers = {
-                "Authorization": f"Bearer {self.supabase_key}",
-                "Content-Type": "application/json",
-                "apikey": self.supabase_key
-            }
+            body_size = os.path.getsize(body_path)
             
-            upload_url = f"{self.supabase_url}/storage/v1/object/{self.bucket_name}/{filename}"
+            # TUS metadata has no Content-Encoding, so gzipped bodies always
+            # take the single POST
+            if body_size > RESUMABLE_UPLOAD_THRESHOLD and not self.gzip_uploads:
+                return await self._upload_resumable(body_path, body_size, filename)
+            return await self._post_object(
+                filename, lambda: self._iter_file(body_path), body_size
+            )
+        
+        return await self._upload(
+            filename,
+            send,
+            lambda: self._save_local_fallback(
+                job_id, lambda path: self._encode_file(json_path, Path(path))
+            )
+        )
+    
+    async def _upload(
+        self,
+        filename: str,
+        send: Callable[[], Awaitable[httpx.Response]],
+        fallback: Callable[[], Awaitable[str]]
+    ) -> str:
+        """
+        Run an upload and turn its outcome into the URL to report
+        
+        Args:
+            filename: Object name within the bucket
+            send: Uploads the object and returns the final response
+            fallback: Saves the data locally and returns its file:// URL
+        
+        Returns:
+            Public URL of the stored object, or the fallback's URL when
+            Supabase is unconfigured or the upload fails
+        """
+        if not self._configured:
+            # Fallback: save to local file for testing
+            return await fallback()
+        
+        try:
+            response = await send()
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    upload_url,
-                    content=json_content,
-                    headers=headers,
-                    timeout=30.0
-                )
-                
-                if response.status_code not in [200, 201]:
-                    logger.error(f"Failed to upload to Supabase: {response.status_code} - {response.text}")
-                    # Fallback to local storage
-                    return await self._save_local_fallback(job_id, animation_data, title)
+            if _is_duplicate_response(response):
+                return self._already_uploaded(filename)
+            
+            if response.status_code not in [200, 201, 204]:
+                logger.error(f"Failed to upload to Supabase: {response.status_code} - {response.text}")
+                # Fallback to local storage
+                return await fallback()
             
             # Generate public URL
-            public_url = f"{self.supabase_url}/storage/v1/object/public/{self.bucket_name}/{filename}"
+            public_url = self._public_url_prefix + filename
             
-            logger.info(f"Successfully uploaded animation data: {public_url}")
+            logger.info(
+                f"Successfully uploaded animation data over {response.http_version}: {public_url}"
+            )
             return public_url
-            
+        
         except Exception as e:
             logger.error(f"Error uploading to Supabase Storage: {str(e)}")
             # Fallback to local storage
-            return await self._save_local_fallback(job_id, animation_data, title)
+            return await fallback()
+    
+    async def _post_object(
+        self,
+        filename: str,
+        content_factory: Callable[[], Any],
+        content_length: Optional[int] = None
+    ) -> httpx.Response:
+        """
+        POST an object to the bucket in the configured format
+        
+        Args:
+            filename: Object name within the bucket
+            content_factory: Returns the request body for one attempt
+            content_length: Body size, when known; lets httpx send a
+                streamed body without chunked transfer encoding
+        
+        Returns:
+            Response to the upload request
+        """
+        headers = {"Content-Type": CONTENT_TYPES[self.data_format]}
+        if content_length is not None:
+            headers["Content-Length"] = str(content_length)
+        if self.gzip_uploads:
+            headers["Content-Encoding"] = "gzip"
+        
+        return await self._request_with_retry(
+            "POST",
+            self._upload_url_prefix + filename,
+            content_factory,
+            headers=headers
+        )
+    
+    async def _request_with_retry(
+        self,
+        method: str,
+        url: str,
+        content_factory: Optional[Callable[[], Any]] = None,
+        **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Send a request, retrying transport errors and transient statuses
+        
+        Streamed bodies can only be sent once, so each attempt builds a fresh
+        body from `content_factory`.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            content_factory: Returns the request body for one attempt
+            **kwargs: Passed through to `httpx.AsyncClient.request`
+            
+        Returns:
+            The first non-retryable response, or the last one once attempts
+            run out; the last transport error is raised instead if every
+            attempt failed in transit
+        """
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(UPLOAD_ATTEMPTS),
+            wait=_retry_wait,
+            retry=(
+                retry_if_exception_type(httpx.TransportError)
+                | retry_if_result(_is_retryable_response)
+            ),
+            before_sleep=_log_retry,
+            retry_error_callback=lambda retry_state: retry_state.outcome.result(),
+        ):
+            with attempt:
+                response = await self._client.request(
+                    method,
+                    url,
+                    content=content_factory() if content_factory else None,
+                    **kwargs
+                )
+            if not attempt.retry_state.outcome.failed:
+                attempt.retry_state.set_result(response)
+        return response
     
-    async def _save_local_fallback(self, job_id: str, animation_data: Dict[str, Any], title: str) -> str:
+    async def _upload_resumable(
+        self, body_path: Path, body_size: int, filename: str
+    ) -> httpx.Response:
+        """
+        Upload a file through the Supabase TUS endpoint in fixed-size chunks
+        
+        TUS requires chunks to be sent in order. If a chunk fails in transit,
+        the server's current offset is fetched with HEAD and the upload
+        resumes from there instead of starting over.
+        
+        Args:
+            body_path: File to upload
+            body_size: Size of the file in bytes
+            filename: Object name within the bucket
+            
+        Returns:
+            Response to the last request; 204 once every chunk is stored
+        """
+        headers = {"Tus-Resumable": "1.0.0"}
+        metadata = {
+            "bucketName": self.bucket_name,
+            "objectName": filename,
+            "contentType": CONTENT_TYPES[self.data_format],
+        }
+        response = await self._request_with_retry(
+            "POST",
+            self._resumable_upload_url,
+            headers={
+                **headers,
+                "Upload-Length": str(body_size),
+                "Upload-Metadata": ",".join(
+                    f"{key} {base64.b64encode(value.encode()).decode()}"
+                    for key, value in metadata.items()
+                ),
+            }
+        )
+        if response.status_code != 201:
+            return response
+        upload_url = response.headers["Location"]
+        
+        offset = 0
+        failed_attempts = 0
+        with open(body_path, 'rb') as f:
+            while offset < body_size:
+                f.seek(offset)
+                chunk = await asyncio.to_thread(f.read, RESUMABLE_CHUNK_SIZE)
+                try:
+                    response = await self._client.patch(
+                        upload_url,
+                        content=chunk,
+                        headers={
+                            **headers,
+                            "Upload-Offset": str(offset),
+                            "Content-Type": "application/offset+octet-stream"
+                        }
+                    )
+                except httpx.TransportError as e:
+                    failed_attempts += 1
+                    if failed_attempts >= RESUMABLE_CHUNK_ATTEMPTS:
+                        raise
+                    logger.warning(f"Resuming upload of {filename} after: {str(e)}")
+                    response = await self._client.head(upload_url, headers=headers)
+                    if response.status_code != 200:
+                        return response
+                    offset = int(response.headers["Upload-Offset"])
+                    continue
+                if response.status_code != 204:
+                    return response
+                offset = int(response.headers["Upload-Offset"])
+        return response
+    
+    def _filename(self, job_id: str) -> str:
+        """Storage filename for a job's animation data"""
+        extension = f".{self.data_format}"
+        if self.gzip_uploads:
+            extension += ".gz"
+        return f"{job_id}{extension}"
+    
+    def _already_uploaded(self, filename: str) -> str:
+        public_url = self._public_url_prefix + filename
+        logger.info(f"Animation data already stored: {public_url}")
+        return public_url
+    
+    def _encode_bytes(self, animation_data: Dict[str, Any], indent: bool = False) -> bytes:
+        """Serialize animation data in the configured format and compression"""
+        if self.float_digits is not None:
+            animation_data = quantize_floats(animation_data, self.float_digits)
+        if self.data_format == "msgpack":
+            import msgpack
+            
+            # Single-precision floats keep timings to well under a millisecond
+            content = msgpack.packb(
+                animation_data, use_bin_type=True, use_single_float=True
+            )
+        else:
+            content = orjson.dumps(
+                animation_data, option=orjson.OPT_INDENT_2 if indent else None
+            )
+        if self.gzip_uploads:
+            content = gzip.compress(content, GZIP_COMPRESS_LEVEL)
+        return content
+    
+    def _write_encoded(self, animation_data: Dict[str, Any], filepath: str) -> None:
+        """Write animation data in the configured format, indenting JSON"""
+        with open(filepath, 'wb') as f:
+            f.write(self._encode_bytes(animation_data, indent=True))
+    
+    def _encode_file(self, json_path: Path, target_path: Path) -> None:
+        """Write an animation JSON file in the configured format and compression"""
+        if self.data_format == "json":
+            if self.gzip_uploads:
+                self._gzip_file(json_path, target_path)
+            else:
+                shutil.copyfile(json_path, target_path)
+            return
+        with open(json_path, 'rb') as f:
+            animation_data = orjson.loads(f.read())
+        with open(target_path, 'wb') as f:
+            f.write(self._encode_bytes(animation_data))
+    
+    @staticmethod
+    def _gzip_file(source_path: Path, target_path: Path) -> None:
+        """Gzip a file in fixed-size chunks"""
+        with open(source_path, 'rb') as src, gzip.open(
+            target_path, 'wb', compresslevel=GZIP_COMPRESS_LEVEL
+        ) as dst:
+            shutil.copyfileobj(src, dst, UPLOAD_CHUNK_SIZE)
+    
+    @staticmethod
+    def _json_chunks(
+        data: Dict[str, Any], float_digits: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """Encode a JSON object piecewise, splitting long top-level lists
+        
+        Floats are rounded one value or batch at a time, so no rounded copy
+        of the whole object is built. The concatenated chunks equal
+        `orjson.dumps(quantize_floats(data, float_digits))`, or
+        `orjson.dumps(data)` without `float_digits`.
+        """
+        def encode(value: Any) -> bytes:
+            if float_digits is not None:
+                value = quantize_floats(value, float_digits)
+            return orjson.dumps(value)
+        
+        yield b"{"
+        for index, (key, value) in enumerate(data.items()):
+            prefix = (b"," if index else b"") + orjson.dumps(key) + b":"
+            if isinstance(value, list) and len(value) > JSON_STREAM_BATCH_SIZE:
+                yield prefix + b"["
+                for start in range(0, len(value), JSON_STREAM_BATCH_SIZE):
+                    batch = encode(value[start:start + JSON_STREAM_BATCH_SIZE])
+                    yield (b"," if start else b"") + batch[1:-1]
+                yield b"]"
+            else:
+                yield prefix + encode(value)
+        yield b"}"
+    
+    @classmethod
+    async def _iter_json(
+        cls,
+        data: Dict[str, Any],
+        compress: bool = False,
+        float_digits: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """Yield a JSON object's bytes in chunks, gzipped on the fly if asked"""
+        compressor = (
+            zlib.compressobj(GZIP_COMPRESS_LEVEL, zlib.DEFLATED, GZIP_WBITS)
+            if compress else None
+        )
+        for chunk in cls._json_chunks(data, float_digits):
+            if compressor is not None:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+        if compressor is not None:
+            yield compressor.flush()
+    
+    @staticmethod
+    async def _iter_file(path: Path) -> AsyncIterator[bytes]:
+        """Yield a file's bytes in chunks, reading off the event loop"""
+        with open(path, 'rb') as f:
+            while True:
+                chunk = await asyncio.to_thread(f.read, UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+    
+    async def _ensure_local_storage_dir(self) -> None:
+        """Create the local fallback directory once per process"""
+        if LOCAL_STORAGE_DIR in self._created_dirs:
+            return
+        await asyncio.to_thread(os.makedirs, LOCAL_STORAGE_DIR, exist_ok=True)
+        self._created_dirs.add(LOCAL_STORAGE_DIR)
+    
+    async def _save_local_fallback(
+        self, job_id: str, write: Callable[[str], None]
+    ) -> str:
         """
         Fallback method to save animation data locally
         This is useful for development and testing
+        
+        Args:
+            job_id: Unique job identifier
+            write: Writes the encoded data to the given path; runs in a
+                worker thread
         """
         try:
             # Create local storage directory
-            local_storage_dir = "/tmp/results"
-            os.makedirs(local_storage_dir, exist_ok=True)
+            await self._ensure_local_storage_dir()
             
             # Generate filename
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            filename = f"{timestamp}_{job_id}.json"
-            filepath = os.path.join(local_storage_dir, filename)
+            filename = self._filename(job_id)
+            filepath = os.path.join(LOCAL_STORAGE_DIR, filename)
             
-            # Save animation data
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(animation_data, f, indent=2, ensure_ascii=False)
+            await asyncio.to_thread(write, filepath)
             
             # Return local file URL (this would need to be served by a static file server in production)
             local_url = f"file://{filepath}"
             
             logger.info(f"Saved animation data locally: {local_url}")
             return local_url
-            
+        
         except Exception as e:
             logger.error(f"Error saving local fallback: {str(e)}")
             raise
@@ -121,36 +639,40 @@ class SupabaseStorage:
         """
         Test connection to Supabase Storage
         
+        Results are cached for CONNECTION_OK_TTL_SECONDS after a success and
+        CONNECTION_FAILED_TTL_SECONDS after a failure, so frequent callers such
+        as readiness probes do not cost a round-trip each time.
+        
         Returns:
             True if connection is successful, False otherwise
         """
+        if not self._configured:
+            logger.warning("Supabase credentials not configured")
+            return False
+        
+        now = time.monotonic()
+        if now < self._connection_checked_until:
+            return self._connection_ok
+        
+        self._connection_ok = await self._check_connection()
+        ttl = CONNECTION_OK_TTL_SECONDS if self._connection_ok else CONNECTION_FAILED_TTL_SECONDS
+        self._connection_checked_until = time.monotonic() + ttl
+        return self._connection_ok
+    
+    async def _check_connection(self) -> bool:
         try:
-            if not self.supabase_url or not self.supabase_key:
-                logger.warning("Supabase credentials not configured")
-                return False
-            
-            headers = {
-                "Authorization": f"Bearer {self.supabase_key}",
-                "apikey": self.supabase_key
-            }
-            
             # Test endpoint - list buckets
             test_url = f"{self.supabase_url}/storage/v1/bucket"
             
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    test_url,
-                    headers=headers,
-                    timeout=10.0
-                )
-                
-                if response.status_code == 200:
-                    logger.info("Supabase Storage connection successful")
-                    return True
-                else:
-                    logger.error(f"Supabase Storage connection failed: {response.status_code}")
-                    return False
+            response = await self._client.get(test_url, timeout=10.0)
+            
+            if response.status_code == 200:
+                logger.info("Supabase Storage connection successful")
+                return True
+            else:
+                logger.error(f"Supabase Storage connection failed: {response.status_code}")
+                return False
                     
         except Exception as e:
             logger.error(f"Error testing Supabase connection: {str(e)}")
-            return False
\ No newline at end of file
+            return False
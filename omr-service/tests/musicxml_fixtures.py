@@ -0,0 +1,15 @@
+"""MusicXML builders shared by the test modules"""
+
+
+def write_page_musicxml(path, part_ids, step):
+    parts = "".join(
+        f'<part id="{part_id}"><measure number="1"><note><pitch>'
+        f"<step>{step}</step><octave>4</octave></pitch>"
+        "<duration>1</duration></note></measure></part>"
+        for part_id in part_ids
+    )
+    path.write_text(
+        f'<score-partwise version="3.1"><part-list/>{parts}</score-partwise>',
+        encoding="utf-8",
+    )
+    return path
@@ -0,0 +1,33 @@
+import os
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+try:
+    with patch.dict(os.environ, {"CONVERTER_WORKERS": "1"}):
+        import app
+except ImportError:  # fastapi and the other service dependencies are not in the bare CI image
+    app = None
+
+
+@unittest.skipIf(app is None, "the service dependencies are required")
+class ConverterPoolTests(unittest.TestCase):
+    def test_broken_pool_is_replaced_once_and_later_conversions_run(self):
+        broken_pool = app.converter_pool
+        self.addCleanup(lambda: app.converter_pool.shutdown(wait=True))
+
+        with self.assertRaises(BrokenProcessPool):
+            broken_pool.submit(os._exit, 1).result(timeout=30)
+
+        app.replace_broken_converter_pool(broken_pool)
+        replacement = app.converter_pool
+        # A second job failing on the same broken pool keeps the replacement
+        app.replace_broken_converter_pool(broken_pool)
+
+        self.assertIsNot(replacement, broken_pool)
+        self.assertIs(app.converter_pool, replacement)
+        self.assertEqual(replacement.submit(pow, 2, 10).result(timeout=30), 1024)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,8 +5,10 @@ import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import AsyncMock, patch
+import xml.etree.ElementTree as ET
 
 from omr.audiveris import AudiverisProcessor
+from musicxml_fixtures import write_page_musicxml
 
 
 OMR_SERVICE_ROOT = Path(__file__).resolve().parents[1]
@@ -118,6 +120,20 @@ class AudiverisProcessorTests(unittest.TestCase):
 
             self.assertEqual(maximum_active_conversions, 1)
 
+    def test_admission_is_bounded_by_running_plus_queued_conversions(self):
+        processor = AudiverisProcessor(
+            audiveris_executable=Path("/nonexistent/Audiveris"),
+            max_concurrent_conversions=1,
+            max_queued_conversions=2,
+        )
+
+        admitted = [processor.admit_conversion() for _ in range(4)]
+        processor.release_conversion()
+
+        self.assertEqual(admitted, [True, True, True, False])
+        self.assertTrue(processor.admit_conversion())
+        self.assertFalse(processor.admit_conversion())
+
     def test_multiple_mxl_outputs_fail_instead_of_returning_partial_score(self):
         with tempfile.TemporaryDirectory() as temporary_directory:
             temp_dir = Path(temporary_directory)
@@ -228,6 +244,117 @@ class AudiverisProcessorTests(unittest.TestCase):
             self.assertTrue(hanging_process.waited)
 
 
+    def test_split_pages_share_one_audiveris_run_per_slot_and_merge_in_order(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            temp_dir = Path(temporary_directory)
+            executable = temp_dir / "Audiveris"
+            executable.touch(mode=0o755)
+            os.chmod(executable, 0o755)
+            pdf_path = temp_dir / "input.pdf"
+            pdf_path.write_bytes(b"%PDF-1.4")
+            output_dir = temp_dir / "output"
+            page_paths = [
+                output_dir / "pages" / "page-0001.pdf",
+                output_dir / "pages" / "page-0002.pdf",
+            ]
+            batch_dir = output_dir / "batch-0"
+            batch_dir.mkdir(parents=True)
+            write_page_musicxml(batch_dir / "page-0001.xml", ["P1"], "C")
+            write_page_musicxml(batch_dir / "page-0002.xml", ["P1"], "D")
+            processor = AudiverisProcessor(
+                audiveris_executable=executable,
+                max_concurrent_conversions=1,
+                split_pages=True,
+            )
+
+            with patch(
+                "omr.audiveris.split_pdf_pages", return_value=page_paths
+            ), patch(
+                "omr.audiveris.asyncio.create_subprocess_exec",
+                new=AsyncMock(return_value=SuccessfulProcess()),
+            ) as create_process:
+                result = asyncio.run(processor.process_pdf(pdf_path, output_dir))
+
+            create_process.assert_awaited_once_with(
+                str(executable),
+                "-batch",
+                "-export",
+                "-output",
+                str(batch_dir),
+                "--",
+                str(page_paths[0]),
+                str(page_paths[1]),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=batch_dir,
+            )
+            measures = ET.parse(result).getroot().findall("part/measure")
+            self.assertEqual([m.get("number") for m in measures], ["1", "2"])
+            self.assertEqual(
+                [m.findtext("note/pitch/step") for m in measures], ["C", "D"]
+            )
+
+    def test_page_batches_finishing_out_of_order_merge_in_page_order(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            temp_dir = Path(temporary_directory)
+            pdf_path = temp_dir / "input.pdf"
+            output_dir = temp_dir / "output"
+            page_paths = [
+                output_dir / "pages" / f"page-000{number}.pdf" for number in (1, 2)
+            ]
+            processor = AudiverisProcessor(
+                audiveris_executable=temp_dir / "Audiveris",
+                max_concurrent_conversions=2,
+                split_pages=True,
+            )
+
+            async def run_batch(batch, batch_dir):
+                # The first page's batch finishes last
+                if batch[0] == page_paths[0]:
+                    await asyncio.sleep(0.01)
+                batch_dir.mkdir(parents=True)
+                step = "C" if batch[0] == page_paths[0] else "D"
+                return [write_page_musicxml(batch_dir / "page.xml", ["P1"], step)]
+
+            with patch(
+                "omr.audiveris.split_pdf_pages", return_value=page_paths
+            ), patch.object(
+                processor, "_process_page_batch_unlocked", new=run_batch
+            ):
+                result = asyncio.run(processor.process_pdf(pdf_path, output_dir))
+
+            measures = ET.parse(result).getroot().findall("part/measure")
+            self.assertEqual(
+                [m.findtext("note/pitch/step") for m in measures], ["C", "D"]
+            )
+
+    def test_single_page_pdf_skips_the_page_merge(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            temp_dir = Path(temporary_directory)
+            executable = temp_dir / "Audiveris"
+            executable.touch(mode=0o755)
+            os.chmod(executable, 0o755)
+            pdf_path = temp_dir / "input.pdf"
+            output_dir = temp_dir / "output"
+            processor = AudiverisProcessor(
+                audiveris_executable=executable,
+                split_pages=True,
+            )
+
+            with patch(
+                "omr.audiveris.split_pdf_pages",
+                return_value=[output_dir / "pages" / "page-0001.pdf"],
+            ), patch.object(
+                processor,
+                "_process_pdf_unlocked",
+                new=AsyncMock(return_value=output_dir / "input.mxl"),
+            ) as process_unlocked:
+                result = asyncio.run(processor.process_pdf(pdf_path, output_dir))
+
+            self.assertEqual(result, output_dir / "input.mxl")
+            process_unlocked.assert_awaited_once_with(pdf_path, output_dir)
+
+
 class DeploymentStaticContractTests(unittest.TestCase):
     def test_app_uses_only_the_native_audiveris_processor(self):
         tree = ast.parse((OMR_SERVICE_ROOT / "app.py").read_text(encoding="utf-8"))
@@ -254,10 +381,21 @@ class DeploymentStaticContractTests(unittest.TestCase):
         self.assertIn("/opt/audiveris/bin/Audiveris", dockerfile)
         self.assertIn("AUDIVERIS_MAX_CONCURRENCY=1", dockerfile)
         self.assertIn("AUDIVERIS_TIMEOUT_SECONDS=900", dockerfile)
+        self.assertIn("AUDIVERIS_MAX_QUEUE=4", dockerfile)
         self.assertIn("grep -Fqx 'java-options=-Xmx3G'", dockerfile)
+        self.assertIn("grep -Fqx 'java-options=-XX:+UseSerialGC'", dockerfile)
         self.assertGreaterEqual(dockerfile.count("--no-install-recommends"), 2)
         self.assertNotIn("openjdk", dockerfile.lower())
 
+    def test_containers_start_uvicorn_as_a_module(self):
+        # Spawned converter workers re-import the main module; app.py as
+        # __main__ would rebuild every service singleton in each worker
+        for name in ("Dockerfile", "Dockerfile.alt", "Dockerfile.audiveris"):
+            dockerfile = (OMR_SERVICE_ROOT / name).read_text(encoding="utf-8")
+
+            self.assertIn('CMD ["python3", "-m", "uvicorn", "app:app"', dockerfile)
+            self.assertNotIn('"app.py"]', dockerfile)
+
     def test_fly_memory_and_bundled_launcher_heap_leave_headroom(self):
         dockerfile = (OMR_SERVICE_ROOT / "Dockerfile.audiveris").read_text(encoding="utf-8")
         fly_configuration = (OMR_SERVICE_ROOT / "fly.toml").read_text(encoding="utf-8")
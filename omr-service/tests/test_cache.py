@@ -0,0 +1,94 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from omr.cache import MusicXMLCache
+
+
+class MusicXMLCacheTests(unittest.TestCase):
+    def test_cached_result_is_copied_into_the_next_job_directory(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            temp_dir = Path(temporary_directory)
+            pdf_path = temp_dir / "input.pdf"
+            pdf_path.write_bytes(b"%PDF-1.4 score")
+            musicxml_path = temp_dir / "input.mxl"
+            musicxml_path.write_bytes(b"PK score")
+            next_job_dir = temp_dir / "next-job"
+            next_job_dir.mkdir()
+            cache = MusicXMLCache(cache_dir=temp_dir / "cache")
+
+            async def store_and_reuse():
+                digest = await cache.digest(pdf_path)
+                self.assertIsNone(await cache.get(digest, next_job_dir))
+                await cache.put(digest, musicxml_path)
+                return await cache.get(digest, next_job_dir)
+
+            cached = asyncio.run(store_and_reuse())
+
+            self.assertEqual(cached, next_job_dir / "cached.mxl")
+            self.assertEqual(cached.read_bytes(), b"PK score")
+
+    def test_expired_entries_are_misses(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            temp_dir = Path(temporary_directory)
+            cache_dir = temp_dir / "cache"
+            cache_dir.mkdir()
+            cached_path = cache_dir / "abc123.mxl"
+            cached_path.write_bytes(b"PK")
+            os.utime(cached_path, (0, 0))
+            cache = MusicXMLCache(cache_dir=cache_dir, ttl_seconds=60)
+
+            result = asyncio.run(cache.get("abc123", temp_dir))
+
+            self.assertIsNone(result)
+            self.assertFalse(cached_path.exists())
+
+    def test_put_sweeps_expired_entries_for_other_digests(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            temp_dir = Path(temporary_directory)
+            cache_dir = temp_dir / "cache"
+            cache_dir.mkdir()
+            stale_path = cache_dir / "old.mxl"
+            stale_path.write_bytes(b"PK old")
+            stale_partial = cache_dir / ".old.123.partial"
+            stale_partial.write_bytes(b"PK")
+            fresh_path = cache_dir / "recent.xml"
+            fresh_path.write_bytes(b"<score-partwise/>")
+            unrelated_path = cache_dir / "notes.txt"
+            unrelated_path.write_bytes(b"keep")
+            for path in (stale_path, stale_partial, unrelated_path):
+                os.utime(path, (0, 0))
+            musicxml_path = temp_dir / "input.mxl"
+            musicxml_path.write_bytes(b"PK new")
+            cache = MusicXMLCache(cache_dir=cache_dir, ttl_seconds=60)
+
+            asyncio.run(cache.put("new", musicxml_path))
+
+            self.assertFalse(stale_path.exists())
+            self.assertFalse(stale_partial.exists())
+            self.assertTrue(fresh_path.exists())
+            self.assertTrue(unrelated_path.exists())
+            self.assertEqual((cache_dir / "new.mxl").read_bytes(), b"PK new")
+
+    def test_sweep_runs_at_most_once_per_interval(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            temp_dir = Path(temporary_directory)
+            musicxml_path = temp_dir / "input.mxl"
+            musicxml_path.write_bytes(b"PK")
+            cache = MusicXMLCache(cache_dir=temp_dir / "cache", ttl_seconds=60)
+
+            async def put_twice():
+                await cache.put("first", musicxml_path)
+                await cache.put("second", musicxml_path)
+
+            with patch.object(cache, "_sweep_sync") as sweep:
+                asyncio.run(put_twice())
+
+            sweep.assert_called_once_with()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import asyncio
+import json
+import multiprocessing
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from omr.converter import MusicXMLToClairKeysConverter
+from musicxml_fixtures import write_page_musicxml
+
+
+class ConverterExecutorTests(unittest.TestCase):
+    def test_process_pool_conversion_writes_the_same_notes_as_convert(self):
+        converter = MusicXMLToClairKeysConverter()
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            temp_dir = Path(temporary_directory)
+            musicxml_path = write_page_musicxml(temp_dir / "score.xml", ["P1"], "E")
+            output_path = temp_dir / "animation.json"
+
+            async def convert_both():
+                spawn = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                    written = await converter.convert_to_file(
+                        musicxml_path, output_path, "Title", None, executor=pool
+                    )
+                return written, await converter.convert(musicxml_path, "Title")
+
+            written, expected = asyncio.run(convert_both())
+
+            self.assertEqual(written, output_path)
+            data = json.loads(output_path.read_text(encoding="utf-8"))
+            self.assertEqual(data["notes"], expected["notes"])
+            self.assertEqual(data["notes"][0]["midi"], 64)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import asyncio
+import json
+import sys
+import types
+import unittest
+from unittest.mock import patch
+
+from omr.jobs import RedisJobStore
+
+
+class StubPipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def hset(self, key, mapping):
+        self.commands.append(("hset", key, mapping))
+
+    def expire(self, key, seconds):
+        self.commands.append(("expire", key, seconds))
+
+    def sadd(self, key, member):
+        self.commands.append(("sadd", key, member))
+
+    async def execute(self):
+        for command, key, arg in self.commands:
+            if command == "hset":
+                self.client.hashes.setdefault(key, {}).update(arg)
+            elif command == "expire":
+                self.client.ttls[key] = arg
+            else:
+                self.client.sets.setdefault(key, set()).add(arg)
+        self.client.executed.append(list(self.commands))
+
+
+class StubRedis:
+    def __init__(self):
+        self.hashes = {}
+        self.ttls = {}
+        self.sets = {}
+        self.executed = []
+        self.closed = False
+
+    def pipeline(self, transaction=True):
+        return StubPipeline(self)
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def aclose(self):
+        self.closed = True
+
+
+def make_store(ttl_seconds):
+    client = StubRedis()
+    redis_module = types.ModuleType("redis")
+    redis_asyncio = types.ModuleType("redis.asyncio")
+    redis_asyncio.from_url = lambda url, decode_responses: client
+    redis_module.asyncio = redis_asyncio
+    with patch.dict(
+        sys.modules, {"redis": redis_module, "redis.asyncio": redis_asyncio}
+    ):
+        store = RedisJobStore("redis://stub", ttl_seconds=ttl_seconds)
+    return store, client
+
+
+class RedisJobStoreTests(unittest.TestCase):
+    def test_nested_fields_round_trip_through_json_encoded_hash_values(self):
+        store, client = make_store(ttl_seconds=60)
+        result = {"animation_data_url": "https://x/a.json", "note_count": 3}
+
+        async def run():
+            await store.create("job-1", {"status": "processing", "progress": 0})
+            await store.update("job-1", status="completed", result=result)
+            return await store.get("job-1")
+
+        job = asyncio.run(run())
+
+        self.assertEqual(
+            job, {"status": "completed", "progress": 0, "result": result}
+        )
+        self.assertEqual(client.hashes["job:job-1"]["result"], json.dumps(result))
+
+    def test_every_write_refreshes_the_ttl_of_job_and_user_keys(self):
+        store, client = make_store(ttl_seconds=90)
+
+        async def run():
+            await store.create("job-1", {"status": "processing"}, user_id="u1")
+            await store.update("job-1", progress=50)
+
+        asyncio.run(run())
+
+        self.assertEqual(client.ttls, {"job:job-1": 90, "user:u1:jobs": 90})
+        self.assertEqual(client.sets, {"user:u1:jobs": {"job-1"}})
+        self.assertIn(("expire", "job:job-1", 90), client.executed[-1])
+
+    def test_unknown_job_is_none_and_close_releases_the_client(self):
+        store, client = make_store(ttl_seconds=60)
+
+        async def run():
+            job = await store.get("missing")
+            await store.close()
+            return job
+
+        self.assertIsNone(asyncio.run(run()))
+        self.assertTrue(client.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import importlib.util
+import tempfile
+import unittest
+from pathlib import Path
+
+from omr.pages import (
+    PDF_MAGIC,
+    check_pdf_page_count,
+    is_pdf_header,
+    merge_musicxml_pages,
+)
+from musicxml_fixtures import write_page_musicxml
+
+
+class PageMergeTests(unittest.TestCase):
+    def test_pages_with_different_parts_are_rejected(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            temp_dir = Path(temporary_directory)
+            first = write_page_musicxml(temp_dir / "first.xml", ["P1", "P2"], "C")
+            second = write_page_musicxml(temp_dir / "second.xml", ["P1"], "D")
+
+            with self.assertRaisesRegex(ValueError, "do not match"):
+                merge_musicxml_pages([first, second], temp_dir / "merged.xml")
+
+
+def write_pdf(path, page_count, password=None):
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for _ in range(page_count):
+        writer.add_blank_page(width=612, height=792)
+    if password is not None:
+        writer.encrypt(password, algorithm="RC4-128")
+    with open(path, "wb") as f:
+        writer.write(f)
+    return path
+
+
+class PdfHeaderTests(unittest.TestCase):
+    def test_only_the_pdf_signature_is_accepted(self):
+        self.assertTrue(is_pdf_header(b"%PDF-"))
+        self.assertFalse(is_pdf_header(b"PK\x03\x04"))
+        self.assertFalse(is_pdf_header(b"<html"))
+        self.assertFalse(is_pdf_header(b""))
+        self.assertEqual(len(PDF_MAGIC), 5)
+
+
+@unittest.skipIf(importlib.util.find_spec("pypdf") is None, "pypdf is required")
+class PdfPageCountTests(unittest.TestCase):
+    def check(self, write):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            pdf_path = write(Path(temporary_directory) / "input.pdf")
+            return check_pdf_page_count(pdf_path, max_pages=3)
+
+    def test_pdf_within_the_limit_returns_its_page_count(self):
+        self.assertEqual(self.check(lambda path: write_pdf(path, 3)), 3)
+
+    def test_pdf_without_pages_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, "no pages"):
+            self.check(lambda path: write_pdf(path, 0))
+
+    def test_pdf_over_the_page_limit_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, "4 pages; at most 3"):
+            self.check(lambda path: write_pdf(path, 4))
+
+    def test_corrupt_pdf_is_rejected(self):
+        def write_corrupt(path):
+            path.write_bytes(b"%PDF-1.4\ngarbage")
+            return path
+
+        with self.assertRaisesRegex(ValueError, "could not be read"):
+            self.check(write_corrupt)
+
+    def test_encrypted_pdf_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, "could not be read"):
+            self.check(lambda path: write_pdf(path, 1, password="secret"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,431 @@
+import asyncio
+import gzip
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+try:
+    import httpx
+    import orjson
+    from omr import storage
+    from omr.converter import quantize_floats
+    from omr.storage import SupabaseStorage
+except ImportError:  # httpx, orjson and tenacity are not in the bare CI image
+    httpx = None
+
+
+SUPABASE_ENV = {
+    "SUPABASE_URL": "https://supabase.test",
+    "SUPABASE_ANON_KEY": "anon-key",
+    "ANIMATION_FLOAT_DIGITS": "3",
+}
+OBJECT_PREFIX = "/storage/v1/object/animation-data/"
+PUBLIC_PREFIX = "https://supabase.test/storage/v1/object/public/animation-data/"
+
+
+def make_storage(handler, **kwargs):
+    """SupabaseStorage whose requests are answered by `handler`"""
+    kwargs.setdefault("gzip_uploads", False)
+    kwargs.setdefault("data_format", "json")
+    with patch.dict(os.environ, SUPABASE_ENV):
+        supabase = SupabaseStorage(**kwargs)
+    supabase._client = httpx.AsyncClient(
+        headers=supabase._client.headers,
+        transport=httpx.MockTransport(handler),
+    )
+    return supabase
+
+
+def animation_data(note_count=3):
+    return {
+        "title": "Test",
+        "notes": [
+            {"note": "C4", "start": i * 0.5, "duration": 0.5, "velocity": 0.8}
+            for i in range(note_count)
+        ],
+    }
+
+
+def no_retry_wait(retry_state):
+    return 0
+
+
+@unittest.skipIf(httpx is None, "httpx, orjson and tenacity are required")
+class SupabaseStorageUploadTests(unittest.TestCase):
+    def test_failed_tus_chunk_resumes_from_the_server_offset(self):
+        body = orjson.dumps({"title": "Test", "notes": []})
+        stored = bytearray()
+        patch_offsets = []
+        failed = []
+
+        def handler(request):
+            if request.method == "POST":
+                self.assertEqual(request.headers["Upload-Length"], str(len(body)))
+                self.assertNotIn("x-upsert", request.headers)
+                return httpx.Response(
+                    201, headers={"Location": "https://supabase.test/tus/1"}
+                )
+            if request.method == "HEAD":
+                return httpx.Response(200, headers={"Upload-Offset": str(len(stored))})
+            offset = int(request.headers["Upload-Offset"])
+            patch_offsets.append(offset)
+            self.assertEqual(offset, len(stored))
+            if offset == 8 and not failed:
+                # The server keeps part of the chunk before the connection drops
+                failed.append(offset)
+                stored.extend(request.content[:4])
+                raise httpx.ReadError("connection reset")
+            stored.extend(request.content)
+            return httpx.Response(204, headers={"Upload-Offset": str(len(stored))})
+
+        supabase = make_storage(handler)
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            json_path = Path(temporary_directory) / "animation.json"
+            json_path.write_bytes(body)
+
+            async def upload():
+                try:
+                    return await supabase.upload_animation_data_file(
+                        "job-1", json_path, "Test"
+                    )
+                finally:
+                    await supabase.aclose()
+
+            with patch.object(storage, "RESUMABLE_UPLOAD_THRESHOLD", 10), \
+                    patch.object(storage, "RESUMABLE_CHUNK_SIZE", 8):
+                url = asyncio.run(upload())
+
+        self.assertEqual(url, PUBLIC_PREFIX + "job-1.json")
+        self.assertEqual(patch_offsets, [0, 8, 12, 20])
+        self.assertEqual(bytes(stored), body)
+
+    def test_transient_status_is_retried_until_the_upload_succeeds(self):
+        statuses = [503, 200]
+        posts = []
+
+        def handler(request):
+            posts.append(request.content)
+            return httpx.Response(statuses[len(posts) - 1])
+
+        supabase = make_storage(handler)
+
+        async def upload():
+            try:
+                return await supabase.upload_animation_data(
+                    "job-1", animation_data(), "Test"
+                )
+            finally:
+                await supabase.aclose()
+
+        with patch.object(storage, "_retry_wait", no_retry_wait):
+            url = asyncio.run(upload())
+
+        self.assertTrue(url.startswith(PUBLIC_PREFIX))
+        self.assertEqual(len(posts), 2)
+        # Each attempt streams a complete, fresh body
+        self.assertEqual(posts[0], posts[1])
+        self.assertEqual(json.loads(posts[1]), animation_data())
+
+    def test_retry_after_a_lost_response_returns_the_stored_object_url(self):
+        stored = {}
+
+        def handler(request):
+            path = request.url.path
+            if path in stored:
+                return httpx.Response(
+                    400, json={"statusCode": "409", "error": "Duplicate"}
+                )
+            first_attempt = path not in stored
+            stored[path] = request.content
+            if first_attempt:
+                # Stored, but the response never reaches the client
+                raise httpx.ReadTimeout("timed out")
+            return httpx.Response(200)
+
+        supabase = make_storage(handler)
+
+        async def upload():
+            try:
+                return await supabase.upload_animation_data(
+                    "job-1", animation_data(), "Test"
+                )
+            finally:
+                await supabase.aclose()
+
+        with patch.object(storage, "_retry_wait", no_retry_wait):
+            url = asyncio.run(upload())
+
+        # Upserting would need SELECT and UPDATE policies on the bucket, so
+        # the retry's Duplicate rejection is what reports success
+        self.assertEqual(url, PUBLIC_PREFIX + "job-1.json")
+        self.assertEqual(len(stored), 1)
+
+    def test_exhausted_transport_errors_fall_back_to_local_storage(self):
+        posts = []
+
+        def handler(request):
+            posts.append(request)
+            raise httpx.ConnectError("connection refused")
+
+        supabase = make_storage(handler)
+
+        async def upload():
+            try:
+                return await supabase.upload_animation_data(
+                    "job-1", animation_data(), "Test"
+                )
+            finally:
+                await supabase.aclose()
+
+        with tempfile.TemporaryDirectory() as temporary_directory, \
+                patch.object(storage, "LOCAL_STORAGE_DIR", temporary_directory), \
+                patch.object(storage, "_retry_wait", no_retry_wait):
+            url = asyncio.run(upload())
+            local_path = Path(temporary_directory) / "job-1.json"
+
+            self.assertEqual(url, f"file://{local_path}")
+            self.assertEqual(json.loads(local_path.read_bytes()), animation_data())
+        self.assertEqual(len(posts), storage.UPLOAD_ATTEMPTS)
+
+    def test_rejected_file_upload_is_copied_to_local_storage(self):
+        def handler(request):
+            return httpx.Response(403, json={"error": "Unauthorized"})
+
+        supabase = make_storage(handler)
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            json_path = Path(temporary_directory) / "animation.json"
+            json_path.write_bytes(orjson.dumps(animation_data()))
+            local_dir = Path(temporary_directory) / "results"
+            local_dir.mkdir()
+
+            async def upload():
+                try:
+                    return await supabase.upload_animation_data_file(
+                        "job-1", json_path, "Test"
+                    )
+                finally:
+                    await supabase.aclose()
+
+            with patch.object(storage, "LOCAL_STORAGE_DIR", str(local_dir)):
+                url = asyncio.run(upload())
+
+            self.assertEqual(url, f"file://{local_dir / 'job-1.json'}")
+            self.assertEqual(
+                (local_dir / "job-1.json").read_bytes(), json_path.read_bytes()
+            )
+
+    def test_streamed_json_rounds_floats_one_batch_at_a_time(self):
+        data = {
+            "title": "Test",
+            "tempo": 120.123456,
+            "notes": [
+                {"note": "C4", "start": i / 3, "duration": 1 / 3}
+                for i in range(2500)
+            ],
+        }
+        original = orjson.dumps(data)
+        requests = []
+        rounded_lengths = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200)
+
+        def spy_quantize_floats(value, digits):
+            if isinstance(value, list):
+                rounded_lengths.append(len(value))
+            return quantize_floats(value, digits)
+
+        supabase = make_storage(handler)
+
+        async def upload():
+            try:
+                return await supabase.upload_animation_data("job-1", data, "Test")
+            finally:
+                await supabase.aclose()
+
+        with patch.object(storage, "quantize_floats", spy_quantize_floats):
+            asyncio.run(upload())
+
+        (request,) = requests
+        self.assertEqual(request.content, orjson.dumps(quantize_floats(data, 3)))
+        self.assertEqual(orjson.dumps(data), original)
+        self.assertLessEqual(max(rounded_lengths), storage.JSON_STREAM_BATCH_SIZE)
+
+    def test_gzipped_streamed_body_decompresses_to_the_orjson_encoding(self):
+        data = animation_data(note_count=2500)
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200)
+
+        supabase = make_storage(handler, gzip_uploads=True)
+
+        async def upload():
+            try:
+                return await supabase.upload_animation_data("job-1", data, "Test")
+            finally:
+                await supabase.aclose()
+
+        url = asyncio.run(upload())
+
+        self.assertTrue(url.endswith(".json.gz"))
+        (request,) = requests
+        self.assertEqual(request.headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(request.content), orjson.dumps(data))
+
+
+    def test_each_job_uploads_to_its_own_object(self):
+        posted_paths = []
+
+        def handler(request):
+            posted_paths.append(request.url.path)
+            return httpx.Response(200)
+
+        supabase = make_storage(handler)
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            json_path = Path(temporary_directory) / "animation.json"
+            json_path.write_bytes(orjson.dumps(animation_data()))
+
+            async def upload():
+                try:
+                    return (
+                        await supabase.upload_animation_data(
+                            "job-1", animation_data(), "Test"
+                        ),
+                        await supabase.upload_animation_data_file(
+                            "job-2", json_path, "Test"
+                        ),
+                    )
+                finally:
+                    await supabase.aclose()
+
+            urls = asyncio.run(upload())
+
+        # Deleting one sheet's animation must never remove another's
+        self.assertEqual(
+            urls, (PUBLIC_PREFIX + "job-1.json", PUBLIC_PREFIX + "job-2.json")
+        )
+        self.assertEqual(
+            posted_paths, [OBJECT_PREFIX + "job-1.json", OBJECT_PREFIX + "job-2.json"]
+        )
+
+    def test_duplicate_rejection_returns_the_stored_object_url(self):
+        def handler(request):
+            return httpx.Response(
+                400,
+                json={
+                    "statusCode": "409",
+                    "error": "Duplicate",
+                    "message": "The resource already exists",
+                },
+            )
+
+        supabase = make_storage(handler)
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            json_path = Path(temporary_directory) / "animation.json"
+            json_path.write_bytes(orjson.dumps(animation_data()))
+
+            async def upload():
+                try:
+                    return await supabase.upload_animation_data_file(
+                        "job-1", json_path, "Test"
+                    )
+                finally:
+                    await supabase.aclose()
+
+            with patch.object(storage, "LOCAL_STORAGE_DIR", temporary_directory):
+                url = asyncio.run(upload())
+
+        self.assertTrue(url.startswith(PUBLIC_PREFIX))
+
+
+    def test_upload_many_keeps_input_order_and_bounds_concurrency(self):
+        in_flight = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            # Later jobs finish first so ordering comes from upload_many
+            job_number = int(request.url.path.rsplit("-", 1)[1].split(".")[0])
+            await asyncio.sleep(0.001 * (10 - job_number))
+            in_flight -= 1
+            return httpx.Response(200)
+
+        supabase = make_storage(handler)
+        jobs = [(f"job-{i}", animation_data(), "Test") for i in range(10)]
+
+        async def upload():
+            try:
+                return await supabase.upload_many(jobs, concurrency=3)
+            finally:
+                await supabase.aclose()
+
+        urls = asyncio.run(upload())
+
+        self.assertEqual(urls, [PUBLIC_PREFIX + f"job-{i}.json" for i in range(10)])
+        self.assertEqual(peak, 3)
+
+
+@unittest.skipIf(httpx is None, "httpx, orjson and tenacity are required")
+class SupabaseStorageConnectionTests(unittest.TestCase):
+    def check_connection_at(self, supabase, times):
+        """Call test_connection once per monotonic clock reading"""
+        async def check():
+            results = []
+            for now in times:
+                with patch.object(storage.time, "monotonic", return_value=now):
+                    results.append(await supabase.test_connection())
+            await supabase.aclose()
+            return results
+
+        return asyncio.run(check())
+
+    def test_success_is_trusted_until_the_ok_ttl_expires(self):
+        gets = []
+
+        def handler(request):
+            gets.append(request)
+            return httpx.Response(200, json=[])
+
+        supabase = make_storage(handler)
+        ttl = storage.CONNECTION_OK_TTL_SECONDS
+
+        results = self.check_connection_at(
+            supabase, [100.0, 100.0 + ttl - 1, 100.0 + ttl]
+        )
+
+        self.assertEqual(results, [True, True, True])
+        self.assertEqual(len(gets), 2)
+
+    def test_failure_expires_after_the_shorter_failed_ttl(self):
+        statuses = [503, 200]
+        gets = []
+
+        def handler(request):
+            gets.append(request)
+            return httpx.Response(statuses[len(gets) - 1])
+
+        supabase = make_storage(handler)
+        ttl = storage.CONNECTION_FAILED_TTL_SECONDS
+
+        results = self.check_connection_at(
+            supabase, [100.0, 100.0 + ttl - 1, 100.0 + ttl]
+        )
+
+        self.assertEqual(results, [False, False, True])
+        self.assertEqual(len(gets), 2)
+        self.assertLess(ttl, storage.CONNECTION_OK_TTL_SECONDS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,7 +9,7 @@ describe('OMR processor behavior and deployment static contracts (issue #22)', (
     expect(() =>
       execFileSync(
         PYTHON,
-        ['-m', 'unittest', 'discover', '-s', 'tests', '-p', 'test_audiveris_runtime.py'],
+        ['-m', 'unittest', 'discover', '-s', 'tests', '-p', 'test_*.py'],
         {
           cwd: OMR_DIR,
           encoding: 'utf-8',